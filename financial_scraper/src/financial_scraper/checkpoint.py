@@ -1,12 +1,16 @@
 """Track progress for resume capability.
 
 Supports interval-based saves to reduce I/O, and uses orjson for faster
-serialization when available.
+serialization when available. Async pipelines use ``asave()`` so the
+pre-save flushes and the write + fsync run in a worker thread instead of
+blocking the event loop.
 """
 
+import asyncio
 import logging
 import os
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -47,17 +51,53 @@ class Checkpoint:
             "failed_extractions": 0,
         }
         self._last_save_time: float = 0.0
+        self._before_save: list[Callable[[], None]] = []
 
-    def save(self):
+    def flush_before_save(self, fn: Callable[[], None]):
+        """Run *fn* before every save, e.g. to make output rows durable.
+
+        A saved checkpoint marks queries/URLs as done, so anything they
+        produced must already be on disk or a crash would lose it for good.
+        """
+        self._before_save.append(fn)
+
+    def _run_before_save(self):
+        for fn in self._before_save:
+            fn()
+
+    def _snapshot(self) -> bytes:
+        """Serialize current state (must run on the thread that mutates it)."""
         data = {
             "completed_queries": list(self.completed_queries),
             "fetched_urls": list(self.fetched_urls),
             "failed_urls": self.failed_urls,
             "stats": self.stats,
         }
+        return _json_dumps(data)
+
+    def save(self):
+        self._run_before_save()
+        self._write(self._snapshot())
+
+    async def asave(self):
+        """Save without blocking the event loop.
+
+        State is serialized on the calling thread (so concurrent mutations
+        can't tear the snapshot); the pre-save hooks and the disk write run
+        in a thread. Hooks run after the snapshot, so output can only be
+        ahead of the recorded progress, never behind it.
+        """
+        payload = self._snapshot()
+        await asyncio.to_thread(self._flush_and_write, payload)
+
+    def _flush_and_write(self, payload: bytes):
+        self._run_before_save()
+        self._write(payload)
+
+    def _write(self, payload: bytes):
         tmp = self.path.with_suffix(".tmp")
         with open(tmp, "wb") as f:
-            f.write(_json_dumps(data))
+            f.write(payload)
             f.flush()
             os.fsync(f.fileno())
         # Windows: os.replace can fail if target is briefly locked (e.g. antivirus).
@@ -121,6 +161,12 @@ class Checkpoint:
         self.stats["total_queries"] += 1
         self.save()
 
+    async def amark_query_done(self, query: str):
+        """Async variant of ``mark_query_done`` for event-loop callers."""
+        self.completed_queries.add(query)
+        self.stats["total_queries"] += 1
+        await self.asave()
+
     def is_url_fetched(self, url: str) -> bool:
         return url in self.fetched_urls
 
@@ -40,6 +40,7 @@ class CrawlPipeline:
         self._dedup = Deduplicator()
         self._checkpoint = Checkpoint(self._config.checkpoint_file)
         self._parquet_writer = ParquetWriter(self._config.output_path)
+        self._checkpoint.flush_before_save(self._parquet_writer.flush)
         self._jsonl_writer = (
             JSONLWriter(self._config.jsonl_path) if self._config.jsonl_path else None
         )
@@ -62,6 +63,12 @@ class CrawlPipeline:
 
     async def run(self):
         """Execute the crawl pipeline."""
+        try:
+            await self._run_inner()
+        finally:
+            self._parquet_writer.close()
+
+    async def _run_inner(self):
         # 1. Load exclusions, checkpoint
         self._exclusions = self._load_exclusions()
         if self._config.resume:
@@ -100,7 +107,7 @@ class CrawlPipeline:
                     logger.info(
                         f"[{si+1}/{len(seed_urls)}] Skipping (excluded): {seed_url}"
                     )
-                    self._checkpoint.mark_query_done(seed_url)
+                    await self._checkpoint.amark_query_done(seed_url)
                     continue
 
                 logger.info(f"\n[{si+1}/{len(seed_urls)}] Crawling: {seed_url}")
@@ -138,7 +145,7 @@ class CrawlPipeline:
                 except Exception:
                     logger.exception(f"  Crawl failed for {seed_url}")
                     self._checkpoint.mark_url_failed(seed_url)
-                    self._checkpoint.mark_query_done(seed_url)
+                    await self._checkpoint.amark_query_done(seed_url)
                     continue
 
                 # Normalize: arun may return a single result or a list
@@ -163,7 +170,8 @@ class CrawlPipeline:
                     self._checkpoint.mark_url_fetched(url)
 
                     # URL dedup
-                    if self._dedup.is_duplicate_url(url):
+                    dup, url_key = self._dedup.check_url(url)
+                    if dup:
                         continue
 
                     # PDF vs HTML extraction
@@ -223,10 +231,12 @@ class CrawlPipeline:
                         continue
 
                     # Content dedup
-                    if self._dedup.is_duplicate_content(ex.text):
+                    dup, content_key = self._dedup.check_content(ex.text)
+                    if dup:
                         continue
 
-                    self._dedup.mark_seen(url, ex.text)
+                    self._dedup.mark_url(url_key)
+                    self._dedup.mark_content(content_key)
                     self._method_counter[ex.extraction_method] += 1
                     page_domain = self._extract_domain(url)
                     self._domain_counter[page_domain] += 1
@@ -269,7 +279,7 @@ class CrawlPipeline:
                     f"{total_failed} failed, avg {avg_words} words"
                 )
 
-                self._checkpoint.mark_query_done(seed_url)
+                await self._checkpoint.amark_query_done(seed_url)
 
         # 6. Summary
         self._print_summary(total_records, len(seed_urls))
@@ -10,7 +10,7 @@ from .html import ExtractionResult
 logger = logging.getLogger(__name__)
 
 # Date patterns for regex scan of PDF content (ordered by specificity)
-_DATE_PATTERNS = [
+_DATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
     # 27 January 2026, 31 December 2024
     r"(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})",
     # January 2026, October 2025
@@ -19,7 +19,8 @@ _DATE_PATTERNS = [
     r"(\d{4}-\d{2}-\d{2})",
     # 31/12/2024
     r"(\d{1,2}/\d{1,2}/\d{4})",
-]
+)]
+_PDF_META_DATE_RE = re.compile(r"(\d{8})")
 
 
 def _parse_date_safe(text: str) -> datetime | None:
@@ -36,7 +37,7 @@ def _extract_content_date(text: str, max_chars: int = 500) -> datetime | None:
     """Regex-scan the first N characters for a date."""
     snippet = text[:max_chars]
     for pat in _DATE_PATTERNS:
-        m = re.search(pat, snippet, re.IGNORECASE)
+        m = pat.search(snippet)
         if m:
             dt = _parse_date_safe(m.group(1))
             if dt:
@@ -54,7 +55,7 @@ def _extract_metadata_date(content_bytes: bytes) -> datetime | None:
             for key in ("CreationDate", "ModDate"):
                 val = meta.get(key, "")
                 if val:
-                    m = re.search(r"(\d{8})", str(val))
+                    m = _PDF_META_DATE_RE.search(str(val))
                     if m:
                         try:
                             return datetime.strptime(m.group(1), "%Y%m%d")
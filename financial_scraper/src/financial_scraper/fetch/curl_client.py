@@ -62,10 +62,15 @@ class CurlSession:
         return self._get_session().post(url, **kwargs)
 
     def set_proxy(self, proxy: str | None):
-        """Update proxy for all future sessions (existing thread-local sessions are recreated)."""
+        """Update proxy for all future sessions.
+
+        The calling thread's session is recreated only if it was built with a
+        different proxy, so re-selecting the same proxy keeps its pooled
+        connections (no new TCP/TLS handshake).
+        """
         self._proxy = proxy
         # Force re-creation on next access
-        if hasattr(self._local, "session"):
+        if hasattr(self._local, "session") and self._local.proxy != proxy:
             try:
                 self._local.session.close()
             except Exception:
@@ -107,6 +112,7 @@ class CurlSession:
         """Return a thread-local session, creating one if needed."""
         if not hasattr(self._local, "session"):
             self._local.session = self._build_session()
+            self._local.proxy = self._proxy
         return self._local.session
 
     def _build_session(self):
@@ -108,18 +108,17 @@ class SyncDomainThrottler:
 
         sem.acquire()
 
-        # Enforce minimum delay between requests to this domain
+        # Enforce minimum delay between requests to this domain. The send
+        # slot is reserved under the lock, so concurrent callers queue up
+        # one delay apart instead of waking together after the same wait.
         with self._lock:
             delay = self._delays.get(domain, self._base_delay)
-            last = self._last_request.get(domain, 0)
-            elapsed = time.monotonic() - last
-            wait = max(0, delay - elapsed)
+            now = time.monotonic()
+            slot = max(now, self._last_request.get(domain, 0) + delay)
+            self._last_request[domain] = slot
 
-        if wait > 0:
-            time.sleep(wait)
-
-        with self._lock:
-            self._last_request[domain] = time.monotonic()
+        if slot > now:
+            time.sleep(slot - now)
 
     def release(self, domain: str):
         """Release the domain semaphore."""
@@ -42,6 +42,7 @@ class FuturesPipeline:
         self._config = config
         self._checkpoint = Checkpoint(config.checkpoint_file)
         self._parquet = ParquetWriter(config.output_path)
+        self._checkpoint.flush_before_save(self._parquet.flush)
         self._jsonl = JSONLWriter(config.jsonl_path) if config.jsonl_path else None
         self._session = requests.Session()
         self._throttler = SyncDomainThrottler(
@@ -61,6 +62,7 @@ class FuturesPipeline:
             self._run_inner()
         finally:
             signal.signal(signal.SIGINT, original_handler)
+            self._parquet.close()
             self._session.close()
 
     def _run_inner(self):
@@ -575,6 +575,9 @@ def build_transcript_config(args):
         fmp_api_key=getattr(args, "fmp_api_key", ""),
         proxies_file=Path(args.proxies_file) if getattr(args, "proxies_file", None) else None,
         browser_fallback=getattr(args, "browser_fallback", False),
+        extract_cache_dir=(
+            Path(args.extract_cache) if getattr(args, "extract_cache", None) else None
+        ),
     )
 
 
@@ -606,6 +609,10 @@ def _add_transcript_args(p: argparse.ArgumentParser):
     p.add_argument("--checkpoint", default=".transcript_checkpoint.json")
     p.add_argument("--resume", action="store_true")
     p.add_argument("--reset", action="store_true", help="Delete checkpoint before running")
+    p.add_argument(
+        "--extract-cache", default=None,
+        help="Directory caching extracted transcripts per URL (skips re-fetching on reruns)",
+    )
 
     # Fallback source
     p.add_argument(
@@ -182,11 +182,13 @@ async def extract(
                 })
                 continue
 
-            if _dedup.is_duplicate_content(ex.text):
+            dup, content_key = _dedup.check_content(ex.text)
+            if dup:
                 results.append({"url": url, "error": "Duplicate content"})
                 continue
 
-            _dedup.mark_seen(url, ex.text)
+            _dedup.mark_url(_dedup.url_key(url))
+            _dedup.mark_content(content_key)
             result_dict = {
                 "url": url,
                 "title": ex.title,
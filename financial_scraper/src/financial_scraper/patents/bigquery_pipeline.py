@@ -70,6 +70,7 @@ class BigQueryPatentPipeline:
         self._config = bq_config
         self._checkpoint = Checkpoint(bq_config.checkpoint_file)
         self._parquet = ParquetWriter(bq_config.output_path)
+        self._checkpoint.flush_before_save(self._parquet.flush)
         self._jsonl = JSONLWriter(bq_config.jsonl_path) if bq_config.jsonl_path else None
         self._shutdown_requested = False
 
@@ -83,6 +84,7 @@ class BigQueryPatentPipeline:
             self._run_inner()
         finally:
             signal.signal(signal.SIGINT, original_handler)
+            self._parquet.close()
 
     def _run_inner(self):
         cfg = self._config
@@ -5,6 +5,7 @@ import hashlib
 import logging
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse, unquote
 from collections import Counter
@@ -27,6 +28,17 @@ from .checkpoint import Checkpoint
 
 logger = logging.getLogger(__name__)
 
+# Optional scheme + authority prefix ("//host" is scheme-relative); cheaper
+# than urlparse() when only the host is needed
+_HOST_RE = re.compile(r"^(?:[a-z][a-z0-9+.\-]*:)?//([^/?#]*)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def _url_host(url: str) -> str:
+    """Lowercased netloc of *url* (same result as ``urlparse(url).netloc.lower()``)."""
+    m = _HOST_RE.match(url)
+    return m.group(1).lower() if m else urlparse(url).netloc.lower()
+
 
 class ScraperPipeline:
     """Main orchestrator: search -> fetch -> extract -> store."""
@@ -42,6 +54,7 @@ class ScraperPipeline:
         self._dedup = Deduplicator()
         self._checkpoint = Checkpoint(self._config.checkpoint_file)
         self._parquet_writer = ParquetWriter(self._config.output_path)
+        self._checkpoint.flush_before_save(self._parquet_writer.flush)
         self._jsonl_writer = (
             JSONLWriter(self._config.jsonl_path) if self._config.jsonl_path else None
         )
@@ -67,6 +80,12 @@ class ScraperPipeline:
 
     async def run(self):
         """Execute the full pipeline."""
+        try:
+            await self._run_inner()
+        finally:
+            self._parquet_writer.close()
+
+    async def _run_inner(self):
         # 1. Tor setup
         if self._config.use_tor:
             self._tor = TorManager(
@@ -108,224 +127,257 @@ class ScraperPipeline:
         logger.info(f"Processing {len(queries)} queries")
 
         # 6. Process each query
+        # DDGSearcher.search blocks (pre-delay sleep + network), so it runs in
+        # a worker thread, and the next pending query's search starts while
+        # this query's pages are fetched. Only one search is ever in flight,
+        # so the searcher's pacing and ratelimit cooldown are unchanged.
+        pending = list(dict.fromkeys(
+            q for q in queries if not self._checkpoint.is_query_done(q)
+        ))
+        pending_pos = {q: i for i, q in enumerate(pending)}
+        prefetched: dict[str, asyncio.Task] = {}
         total_records = 0
-        for qi, query in enumerate(queries):
-            if self._checkpoint.is_query_done(query):
-                logger.info(f"[{qi+1}/{len(queries)}] Skipping (already done): '{query}'")
-                continue
+        try:
+            for qi, query in enumerate(queries):
+                if self._checkpoint.is_query_done(query):
+                    logger.info(f"[{qi+1}/{len(queries)}] Skipping (already done): '{query}'")
+                    continue
 
-            logger.info(f"\n[{qi+1}/{len(queries)}] '{query}'")
+                logger.info(f"\n[{qi+1}/{len(queries)}] '{query}'")
 
-            # Search
-            search_results = self._searcher.search(
-                query, self._config.max_results_per_query
-            )
+                # Search (already running if prefetched), then start the next one
+                task = prefetched.pop(query, None) or self._start_search(query)
+                search_results = await task
+                nxt = pending_pos[query] + 1
+                if nxt < len(pending):
+                    prefetched[pending[nxt]] = self._start_search(pending[nxt])
 
-            if not search_results:
-                logger.warning(f"No search results for '{query}'")
-                self._checkpoint.mark_query_done(query)
-                continue
-
-            # Filter exclusions and dedup
-            filtered = []
-            excluded = 0
-            already_seen = 0
-            for sr in search_results:
-                if self._is_excluded_domain(sr.url):
-                    excluded += 1
-                    continue
-                if self._dedup.is_duplicate_url(sr.url):
-                    already_seen += 1
-                    continue
-                if self._checkpoint.is_url_fetched(sr.url):
-                    already_seen += 1
+                if not search_results:
+                    logger.warning(f"No search results for '{query}'")
+                    await self._checkpoint.amark_query_done(query)
                     continue
-                filtered.append(sr)
 
-            logger.info(
-                f"  {len(search_results)} results -> {len(filtered)} to fetch "
-                f"({excluded} excluded, {already_seen} already seen)"
-            )
-
-            if not filtered:
-                self._checkpoint.mark_query_done(query)
-                continue
-
-            # BFS crawl loop
-            all_seen_urls: set[str] = set()
-            # url -> query mapping so crawled pages keep the original query
-            url_to_query: dict[str, str] = {}
-            urls_to_fetch: list[str] = []
-            for sr in filtered:
-                urls_to_fetch.append(sr.url)
-                url_to_query[sr.url] = sr.query
-                all_seen_urls.add(sr.url)
-
-            current_depth = 0
-            max_depth = self._config.crawl_depth if self._config.crawl else 0
-            all_records: list[dict] = []
-            total_success = 0
-            total_failed = 0
-
-            throttler = DomainThrottler(
-                max_per_domain=self._config.max_concurrent_per_domain
-            )
-            robot_checker = RobotChecker()
+                # Filter exclusions and dedup
+                filtered = []
+                excluded = 0
+                already_seen = 0
+                # url -> dedup key, so accepted pages are marked without rehashing
+                url_keys: dict[str, int] = {}
+                for sr in search_results:
+                    if self._is_excluded_domain(sr.url):
+                        excluded += 1
+                        continue
+                    dup, url_keys[sr.url] = self._dedup.check_url(sr.url)
+                    if dup:
+                        already_seen += 1
+                        continue
+                    if self._checkpoint.is_url_fetched(sr.url):
+                        already_seen += 1
+                        continue
+                    filtered.append(sr)
 
-            while urls_to_fetch:
-                depth_label = f"depth {current_depth}"
                 logger.info(
-                    f"  [{depth_label}] Fetching {len(urls_to_fetch)} URLs"
+                    f"  {len(search_results)} results -> {len(filtered)} to fetch "
+                    f"({excluded} excluded, {already_seen} already seen)"
                 )
 
-                async with FetchClient(
-                    self._config, throttler, robot_checker, self._tor
-                ) as client:
-                    fetch_results = await client.fetch_batch(urls_to_fetch)
-
-                next_depth_urls: list[str] = []
-
-                for url, fr in zip(urls_to_fetch, fetch_results):
-                    source_query = url_to_query.get(url, query)
+                if not filtered:
+                    await self._checkpoint.amark_query_done(query)
+                    continue
 
-                    if fr.error:
-                        self._checkpoint.mark_url_failed(url)
-                        total_failed += 1
-                        continue
+                # BFS crawl loop
+                all_seen_urls: set[str] = set()
+                # url -> query mapping so crawled pages keep the original query
+                url_to_query: dict[str, str] = {}
+                urls_to_fetch: list[str] = []
+                for sr in filtered:
+                    urls_to_fetch.append(sr.url)
+                    url_to_query[sr.url] = sr.query
+                    all_seen_urls.add(sr.url)
+
+                current_depth = 0
+                max_depth = self._config.crawl_depth if self._config.crawl else 0
+                all_records: list[dict] = []
+                total_success = 0
+                total_failed = 0
+
+                throttler = DomainThrottler(
+                    max_per_domain=self._config.max_concurrent_per_domain
+                )
+                robot_checker = RobotChecker()
 
-                    # Extract content
-                    is_pdf = fr.content_bytes and (
-                        "application/pdf" in fr.content_type
-                        or url.lower().endswith(".pdf")
+                while urls_to_fetch:
+                    depth_label = f"depth {current_depth}"
+                    logger.info(
+                        f"  [{depth_label}] Fetching {len(urls_to_fetch)} URLs"
                     )
-                    if is_pdf:
-                        if self._pdf_dir:
-                            self._save_pdf(fr.content_bytes, url)
-                        ex = self._pdf_extractor.extract(fr.content_bytes, url)
-                    elif fr.html:
-                        if self._html_dir:
-                            self._save_html(fr.html, url)
-                        ex = self._extractor.extract(fr.html, url)
-                    else:
-                        total_failed += 1
-                        continue
 
-                    # Count this page for domain cap (before link extraction)
-                    fetch_domain = self._extract_domain(url)
-                    self._domain_page_counts[fetch_domain] += 1
-
-                    # Crawl: extract links from HTML for next depth
-                    if (
-                        self._config.crawl
-                        and current_depth < max_depth
-                        and fr.html
-                        and not is_pdf
-                    ):
-                        raw_links = extract_links(fr.html, url)
-                        source_domain = self._extract_domain(url)
-                        new_links = filter_links_same_domain(
-                            raw_links,
-                            source_domain,
-                            self._exclusions,
-                            all_seen_urls,
-                            self._domain_page_counts,
-                            self._config.max_pages_per_domain,
-                        )
-                        for link in new_links:
-                            if self._checkpoint.is_url_fetched(link):
-                                continue
-                            if self._dedup.is_duplicate_url(link):
-                                continue
-                            # Hard cap: never queue more than max_pages_per_domain total crawl URLs per depth
-                            if len(next_depth_urls) >= self._config.max_pages_per_domain:
-                                break
-                            all_seen_urls.add(link)
-                            url_to_query[link] = source_query
-                            next_depth_urls.append(link)
-
-                    if ex.extraction_method == "failed" or ex.word_count < self._config.min_word_count:
-                        self._checkpoint.stats["failed_extractions"] += 1
-                        total_failed += 1
-                        continue
+                    async with FetchClient(
+                        self._config, throttler, robot_checker, self._tor
+                    ) as client:
+                        fetch_results = await client.fetch_batch(urls_to_fetch)
 
-                    # Post-extraction content-type filter: reject non-article pages
-                    if self._cleaner.is_ticker_page(ex.text):
-                        logger.debug(f"  Skipped ticker/profile page: {url}")
-                        self._checkpoint.stats["failed_extractions"] += 1
-                        total_failed += 1
-                        continue
-                    if self._cleaner.is_nature_index_page(ex.text):
-                        logger.debug(f"  Skipped Nature Index profile: {url}")
-                        self._checkpoint.stats["failed_extractions"] += 1
-                        total_failed += 1
-                        continue
+                    next_depth_urls: list[str] = []
 
-                    # Date filter
-                    if self._date_filter.is_active and not self._date_filter.passes(ex.date):
-                        continue
+                    for url, fr in zip(urls_to_fetch, fetch_results):
+                        source_query = url_to_query.get(url, query)
 
-                    # Content dedup
-                    if self._dedup.is_duplicate_content(ex.text):
-                        continue
+                        if fr.error:
+                            self._checkpoint.mark_url_failed(url)
+                            total_failed += 1
+                            continue
 
-                    self._checkpoint.mark_url_fetched(url)
-                    self._dedup.mark_seen(url, ex.text)
-                    self._method_counter[ex.extraction_method] += 1
-                    domain = self._extract_domain(url)
-                    self._domain_counter[domain] += 1
-
-                    # Snippet: first 300 chars of content
-                    snippet = (ex.text[:300] + "...") if len(ex.text) > 300 else ex.text
-
-                    record = {
-                        "company": source_query,
-                        "title": ex.title or "",
-                        "link": url,
-                        "snippet": snippet,
-                        "date": ex.date or "",
-                        "source": domain,
-                        "full_text": ex.text,
-                        "source_file": make_source_file_tag(
-                            source_query, ex.date, self._config.search_type
-                        ),
-                    }
-                    all_records.append(record)
-                    total_success += 1
-                    self._checkpoint.stats["total_pages"] += 1
-                    self._checkpoint.stats["total_words"] += ex.word_count
-
-                if next_depth_urls:
-                    logger.info(
-                        f"  [{depth_label}] Discovered {len(next_depth_urls)} "
-                        f"links for depth {current_depth + 1}"
-                    )
+                        # Extract content
+                        is_pdf = fr.content_bytes and (
+                            "application/pdf" in fr.content_type
+                            or url.lower().endswith(".pdf")
+                        )
+                        if is_pdf:
+                            if self._pdf_dir:
+                                self._save_pdf(fr.content_bytes, url)
+                            ex = self._pdf_extractor.extract(fr.content_bytes, url)
+                        elif fr.html:
+                            if self._html_dir:
+                                self._save_html(fr.html, url)
+                            ex = self._extractor.extract(fr.html, url)
+                        else:
+                            total_failed += 1
+                            continue
+
+                        # Count this page for domain cap (before link extraction)
+                        fetch_domain = self._extract_domain(url)
+                        self._domain_page_counts[fetch_domain] += 1
+
+                        # Crawl: extract links from HTML for next depth
+                        if (
+                            self._config.crawl
+                            and current_depth < max_depth
+                            and fr.html
+                            and not is_pdf
+                        ):
+                            raw_links = extract_links(fr.html, url)
+                            new_links = filter_links_same_domain(
+                                raw_links,
+                                fetch_domain,
+                                self._exclusions,
+                                all_seen_urls,
+                                self._domain_page_counts,
+                                self._config.max_pages_per_domain,
+                            )
+                            for link in new_links:
+                                if self._checkpoint.is_url_fetched(link):
+                                    continue
+                                dup, link_key = self._dedup.check_url(link)
+                                if dup:
+                                    continue
+                                # Hard cap: never queue more than max_pages_per_domain total crawl URLs per depth
+                                if len(next_depth_urls) >= self._config.max_pages_per_domain:
+                                    break
+                                all_seen_urls.add(link)
+                                url_to_query[link] = source_query
+                                url_keys[link] = link_key
+                                next_depth_urls.append(link)
+
+                        if ex.extraction_method == "failed" or ex.word_count < self._config.min_word_count:
+                            self._checkpoint.stats["failed_extractions"] += 1
+                            total_failed += 1
+                            continue
+
+                        # Post-extraction content-type filter: reject non-article pages
+                        if self._cleaner.is_ticker_page(ex.text):
+                            logger.debug(f"  Skipped ticker/profile page: {url}")
+                            self._checkpoint.stats["failed_extractions"] += 1
+                            total_failed += 1
+                            continue
+                        if self._cleaner.is_nature_index_page(ex.text):
+                            logger.debug(f"  Skipped Nature Index profile: {url}")
+                            self._checkpoint.stats["failed_extractions"] += 1
+                            total_failed += 1
+                            continue
+
+                        # Date filter
+                        if self._date_filter.is_active and not self._date_filter.passes(ex.date):
+                            continue
+
+                        # Content dedup
+                        dup, content_key = self._dedup.check_content(ex.text)
+                        if dup:
+                            continue
+
+                        self._checkpoint.mark_url_fetched(url)
+                        self._dedup.mark_url(url_keys[url])
+                        self._dedup.mark_content(content_key)
+                        self._method_counter[ex.extraction_method] += 1
+                        domain = fetch_domain
+                        self._domain_counter[domain] += 1
+
+                        # Snippet: first 300 chars of content
+                        snippet = (ex.text[:300] + "...") if len(ex.text) > 300 else ex.text
+
+                        record = {
+                            "company": source_query,
+                            "title": ex.title or "",
+                            "link": url,
+                            "snippet": snippet,
+                            "date": ex.date or "",
+                            "source": domain,
+                            "full_text": ex.text,
+                            "source_file": make_source_file_tag(
+                                source_query, ex.date, self._config.search_type
+                            ),
+                        }
+                        all_records.append(record)
+                        total_success += 1
+                        self._checkpoint.stats["total_pages"] += 1
+                        self._checkpoint.stats["total_words"] += ex.word_count
+
+                    if next_depth_urls:
+                        logger.info(
+                            f"  [{depth_label}] Discovered {len(next_depth_urls)} "
+                            f"links for depth {current_depth + 1}"
+                        )
 
-                current_depth += 1
-                urls_to_fetch = next_depth_urls
-
-            # Write batch (all depths)
-            if all_records:
-                self._parquet_writer.append(all_records)
-                if self._jsonl_writer:
-                    self._jsonl_writer.append(all_records)
-                if self._markdown_writer:
-                    self._markdown_writer.append(all_records)
-                total_records += len(all_records)
-
-            avg_words = (
-                sum(len(r["full_text"].split()) for r in all_records) // len(all_records)
-                if all_records else 0
-            )
-            logger.info(
-                f"  Query done: {total_success} new pages, {total_failed} failed, "
-                f"avg {avg_words} words"
-            )
+                    current_depth += 1
+                    urls_to_fetch = next_depth_urls
+
+                # Write batch (all depths)
+                if all_records:
+                    self._parquet_writer.append(all_records)
+                    if self._jsonl_writer:
+                        self._jsonl_writer.append(all_records)
+                    if self._markdown_writer:
+                        self._markdown_writer.append(all_records)
+                    total_records += len(all_records)
+
+                avg_words = (
+                    sum(len(r["full_text"].split()) for r in all_records) // len(all_records)
+                    if all_records else 0
+                )
+                logger.info(
+                    f"  Query done: {total_success} new pages, {total_failed} failed, "
+                    f"avg {avg_words} words"
+                )
 
-            self._checkpoint.mark_query_done(query)
+                await self._checkpoint.amark_query_done(query)
+        finally:
+            # A raise or cancellation mid-loop leaves the next query's search
+            # running. Cancelling its task does not stop the worker thread,
+            # so the searcher is told to stop too; the task is then collected
+            # so it is not reported as "exception was never retrieved".
+            if prefetched:
+                self._searcher.cancel()
+            for t in prefetched.values():
+                t.cancel()
+            await asyncio.gather(*prefetched.values(), return_exceptions=True)
 
         # 7. Summary
         self._print_summary(total_records, len(queries))
 
+    def _start_search(self, query: str) -> asyncio.Task:
+        return asyncio.create_task(asyncio.to_thread(
+            self._searcher.search, query, self._config.max_results_per_query
+        ))
+
     def _save_pdf(self, content_bytes: bytes, url: str):
         """Save raw PDF bytes to disk with a URL-derived filename."""
         parsed = urlparse(url)
@@ -435,4 +487,4 @@ class ScraperPipeline:
 
     @staticmethod
     def _extract_domain(url: str) -> str:
-        return urlparse(url).netloc.lower()
+        return _url_host(url)
@@ -4,6 +4,7 @@ import asyncio
 import logging
 import random
 import sys
+import threading
 import time
 from dataclasses import dataclass
 
@@ -34,6 +35,7 @@ class SearchResult:
 
 
 MAX_COOLDOWN_SECONDS = 120  # Cap extra delay so it never spirals unboundedly
+CANCEL_POLL_SECONDS = 0.5  # How often waits check for cancel()
 
 
 class DDGSearcher:
@@ -46,6 +48,26 @@ class DDGSearcher:
         self._consecutive_ratelimits = 0
         self._last_search_time = 0.0
         self._hit_ratelimit = False  # set by _do_search_with_retry
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop searching: later searches, retries and waits are skipped.
+
+        Searches run in worker threads that asyncio cannot interrupt, so the
+        caller flags them instead. A request already sent still completes;
+        the search then returns no results. Irreversible for this searcher.
+        """
+        self._cancelled.set()
+
+    def _pause(self, seconds: float) -> bool:
+        """Sleep *seconds* in short slices; True as soon as cancel() is called."""
+        while seconds > 0:
+            if self._cancelled.is_set():
+                return True
+            step = min(seconds, CANCEL_POLL_SECONDS)
+            time.sleep(step)
+            seconds -= step
+        return self._cancelled.is_set()
 
     def _get_proxy(self) -> str | None:
         if self._tor and self._tor.is_available:
@@ -60,13 +82,18 @@ class DDGSearcher:
             from duckduckgo_search import DDGS
             return DDGS
 
-    def _do_search_inner(self, query: str, max_results: int) -> list[dict]:
-        """Execute DDG search. May raise RatelimitException."""
+    def _do_search_inner(self, query: str, max_results: int,
+                         search_type: str | None = None) -> list[dict]:
+        """Execute DDG search. May raise RatelimitException.
+
+        ``search_type`` overrides ``config.search_type`` for this call only.
+        """
         DDGS = self._get_ddgs_class()
         proxy = self._get_proxy()
+        search_type = search_type or self._config.search_type
 
         with DDGS(proxy=proxy) as ddgs:
-            if self._config.search_type == "news":
+            if search_type == "news":
                 raw = list(ddgs.news(
                     query,
                     max_results=max_results,
@@ -84,7 +111,8 @@ class DDGSearcher:
                 ))
         return raw
 
-    def _do_search_with_retry(self, query: str, max_results: int) -> list[dict]:
+    def _do_search_with_retry(self, query: str, max_results: int,
+                              search_type: str | None = None) -> list[dict]:
         """Search with tenacity retry on ratelimit."""
         try:
             from ddgs.exceptions import RatelimitException
@@ -93,23 +121,29 @@ class DDGSearcher:
 
         self._hit_ratelimit = False
         for attempt in range(3):
+            if self._cancelled.is_set():
+                break
             try:
-                return self._do_search_inner(query, max_results)
+                return self._do_search_inner(query, max_results, search_type=search_type)
             except RatelimitException:
                 self._hit_ratelimit = True
                 logger.warning(f"DDG ratelimit on attempt {attempt + 1}/3 for '{query[:40]}...'")
                 if self._tor and self._tor.is_available:
                     self._tor.on_ratelimit()
                 wait = 10 * (2 ** attempt)  # 10s, 20s, 40s
-                time.sleep(wait)
+                if self._pause(wait):
+                    break
             except Exception as e:
                 logger.warning(f"DDG search error: {e}")
-                if attempt < 2:
-                    time.sleep(2 ** (attempt + 1))
+                if attempt < 2 and self._pause(2 ** (attempt + 1)):
+                    break
         return []
 
-    def search(self, query: str, max_results: int) -> list[SearchResult]:
+    def search(self, query: str, max_results: int,
+               search_type: str | None = None) -> list[SearchResult]:
         """Full search with pre-delay and rate limit tracking."""
+        if self._cancelled.is_set():
+            return []
         # Pre-delay
         delay = random.uniform(self._config.search_delay_min,
                                self._config.search_delay_max)
@@ -120,8 +154,8 @@ class DDGSearcher:
                         f"(consecutive ratelimits: {self._consecutive_ratelimits})")
 
         elapsed = time.time() - self._last_search_time
-        if elapsed < delay:
-            time.sleep(delay - elapsed)
+        if elapsed < delay and self._pause(delay - elapsed):
+            return []
 
         # Tor circuit renewal check
         if self._tor and self._tor.is_available and self._tor.should_renew():
@@ -129,7 +163,7 @@ class DDGSearcher:
 
         self._last_search_time = time.time()
 
-        raw = self._do_search_with_retry(query, max_results)
+        raw = self._do_search_with_retry(query, max_results, search_type=search_type)
 
         # Only track actual ratelimits, not empty results from obscure queries
         if self._hit_ratelimit:
@@ -156,11 +190,4 @@ class DDGSearcher:
 
     def search_news(self, query: str, max_results: int) -> list[SearchResult]:
         """Alias that forces news search mode."""
-        original = self._config.search_type
-        # Temporarily override - since config is frozen, we work around it
-        old_type = self._config.search_type
-        try:
-            object.__setattr__(self._config, 'search_type', 'news')
-            return self.search(query, max_results)
-        finally:
-            object.__setattr__(self._config, 'search_type', old_type)
+        return self.search(query, max_results, search_type="news")
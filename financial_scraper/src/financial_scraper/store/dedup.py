@@ -1,10 +1,41 @@
-"""URL + content hash deduplication with persistence."""
+"""URL + content hash deduplication with persistence.
+
+Dedup keys are 128-bit integers from xxh3 (``pip install xxhash``) or, when
+xxhash is missing, BLAKE2b. These are not security boundaries, so a fast
+non-cryptographic hash is enough, and ints are cheaper to store in sets
+than 64-char hex strings.
+
+State is persisted with pickle protocol 5: the key sets are stored as raw
+ints and MinHash signatures as raw bytes. Loading goes through a restricted
+unpickler that refuses to resolve any global, so only builtin containers and
+scalars can come back out of the file. Legacy JSON state files still load.
+"""
 
 import hashlib
+import io
 import json
+import logging
+import pickle
+from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urlparse, urldefrag
 
+logger = logging.getLogger(__name__)
+
+try:
+    import xxhash
+
+    _HASH_NAME = "xxh3_128"
+
+    def _digest(data: bytes) -> int:
+        return xxhash.xxh3_128_intdigest(data)
+
+except ImportError:
+    _HASH_NAME = "blake2b_128"
+
+    def _digest(data: bytes) -> int:  # type: ignore[misc]
+        return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "big")
+
 try:
     from datasketch import MinHash, MinHashLSH
 
@@ -13,6 +44,26 @@ except ImportError:
     _HAS_DATASKETCH = False
 
 
+@dataclass
+class ContentKey:
+    """Hashes of one document, computed once by ``check_content``.
+
+    The MinHash is only built during the check when the fuzzy index is
+    non-empty; otherwise ``mark_content`` builds it from ``text``.
+    """
+
+    text: str
+    hash: int
+    minhash: "MinHash | None" = None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """Unpickler limited to builtin containers/scalars (no class lookups)."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"global {module}.{name} not allowed in dedup state")
+
+
 class Deduplicator:
     """URL + content hash deduplication."""
 
@@ -21,104 +72,162 @@ class Deduplicator:
     SHINGLE_SIZE = 3
 
     def __init__(self):
-        self._seen_urls: set[str] = set()
-        self._seen_content: set[str] = set()
+        self._seen_urls: set[int] = set()
+        self._seen_content: set[int] = set()
         # Fuzzy dedup (gracefully disabled when datasketch missing)
         self._lsh: object | None = None
         self._minhashes: dict[str, "MinHash"] = {}
         self._doc_counter: int = 0
+        self._empty_minhash: "MinHash | None" = None
         if _HAS_DATASKETCH:
             self._lsh = MinHashLSH(threshold=self.LSH_THRESHOLD, num_perm=self.NUM_PERM)
+            self._empty_minhash = MinHash(num_perm=self.NUM_PERM)
 
     def _normalize_url(self, url: str) -> str:
         url = urldefrag(url)[0]  # remove fragment
         url = url.lower().rstrip("/")
         return url
 
-    def _hash_url(self, url: str) -> str:
+    def _hash_url(self, url: str) -> int:
         normalized = self._normalize_url(url)
-        return hashlib.sha256(normalized.encode()).hexdigest()
+        return _digest(normalized.encode("utf-8", "ignore"))
 
-    def _hash_content(self, content: str) -> str:
-        return hashlib.sha256(content[:2000].encode()).hexdigest()
+    def _hash_content(self, content: str) -> int:
+        return _digest(content[:2000].encode("utf-8", "ignore"))
 
     def _minhash_content(self, content: str) -> "MinHash | None":
         if not _HAS_DATASKETCH:
             return None
         words = content.split()
-        m = MinHash(num_perm=self.NUM_PERM)
+        # copy() reuses the permutation vectors instead of regenerating them
+        m = self._empty_minhash.copy()
         if len(words) < self.SHINGLE_SIZE:
             # For very short content, hash the whole thing as one shingle
             m.update(" ".join(words).encode("utf-8"))
         else:
-            for i in range(len(words) - self.SHINGLE_SIZE + 1):
-                shingle = " ".join(words[i : i + self.SHINGLE_SIZE])
-                m.update(shingle.encode("utf-8"))
+            # One vectorized permutation pass over all shingles
+            n = self.SHINGLE_SIZE
+            m.update_batch([
+                " ".join(words[i : i + n]).encode("utf-8")
+                for i in range(len(words) - n + 1)
+            ])
         return m
 
-    def is_duplicate_url(self, url: str) -> bool:
+    def url_key(self, url: str) -> int:
+        return self._hash_url(url)
+
+    def check_url(self, url: str) -> tuple[bool, int]:
+        """Return ``(is_duplicate, key)``; pass the key to ``mark_url``."""
         h = self._hash_url(url)
-        return h in self._seen_urls
+        return h in self._seen_urls, h
+
+    def mark_url(self, key: int):
+        self._seen_urls.add(key)
+
+    def check_content(self, content: str) -> tuple[bool, ContentKey]:
+        """Return ``(is_duplicate, key)``; pass the key to ``mark_content``."""
+        key = ContentKey(content, self._hash_content(content))
+        if key.hash in self._seen_content:
+            return True, key
+        # Fuzzy check via MinHash LSH (nothing to match until a doc is indexed)
+        if self._lsh is not None and self._minhashes and content.strip():
+            key.minhash = self._minhash_content(content)
+            if key.minhash is not None and self._lsh.query(key.minhash):
+                return True, key
+        return False, key
+
+    def mark_content(self, key: ContentKey):
+        if not key.text:
+            return
+        self._seen_content.add(key.hash)
+        # Insert into LSH index, reusing the MinHash from the check if any
+        if self._lsh is not None:
+            m = key.minhash or self._minhash_content(key.text)
+            if m is not None:
+                doc_id = str(self._doc_counter)
+                self._lsh.insert(doc_id, m)
+                self._minhashes[doc_id] = m
+                self._doc_counter += 1
+
+    def is_duplicate_url(self, url: str) -> bool:
+        return self.check_url(url)[0]
 
     def is_duplicate_content(self, content: str) -> bool:
-        h = self._hash_content(content)
-        if h in self._seen_content:
-            return True
-        # Fuzzy check via MinHash LSH
-        if self._lsh is not None and content.strip():
-            m = self._minhash_content(content)
-            if m is not None:
-                matches = self._lsh.query(m)
-                if matches:
-                    return True
-        return False
+        return self.check_content(content)[0]
 
     def mark_seen(self, url: str, content: str):
-        self._seen_urls.add(self._hash_url(url))
+        """Mark *url* and *content* seen, hashing both from scratch.
+
+        Callers that already ran ``check_url``/``check_content`` should use
+        ``mark_url``/``mark_content`` with the returned keys instead.
+        """
+        self.mark_url(self._hash_url(url))
         if content:
-            self._seen_content.add(self._hash_content(content))
-            # Insert into LSH index
-            if self._lsh is not None:
-                m = self._minhash_content(content)
-                if m is not None:
-                    key = str(self._doc_counter)
-                    self._lsh.insert(key, m)
-                    self._minhashes[key] = m
-                    self._doc_counter += 1
+            self.mark_content(ContentKey(content, self._hash_content(content)))
 
     def content_hash(self, content: str) -> str:
-        return self._hash_content(content)
+        return f"{self._hash_content(content):032x}"
 
     def save(self, path: Path):
         data = {
-            "urls": list(self._seen_urls),
-            "content": list(self._seen_content),
+            "hash": _HASH_NAME,
+            "urls": self._seen_urls,
+            "content": self._seen_content,
         }
         if self._minhashes:
+            data["minhash_dtype"] = self._empty_minhash.hashvalues.dtype.str
             data["minhash"] = {
-                k: m.hashvalues.tobytes().hex() for k, m in self._minhashes.items()
+                k: m.hashvalues.tobytes() for k, m in self._minhashes.items()
             }
-        with open(path, "w") as f:
-            json.dump(data, f)
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=5)
 
     def load(self, path: Path):
         if not path.exists():
             return
-        with open(path) as f:
-            data = json.load(f)
-        self._seen_urls = set(data.get("urls", []))
-        self._seen_content = set(data.get("content", []))
+        raw = path.read_bytes()
+        if raw[:1] == b"{":
+            data = self._decode_legacy_json(raw)
+        else:
+            data = _StateUnpickler(io.BytesIO(raw)).load()
+        if data.get("hash") == _HASH_NAME:
+            self._seen_urls = set(data.get("urls", ()))
+            self._seen_content = set(data.get("content", ()))
+        else:
+            # Written with a different hash function: keys can't match
+            logger.warning(
+                "Dedup state %s uses hash %r (expected %r); ignoring exact-match keys",
+                path, data.get("hash", "sha256"), _HASH_NAME,
+            )
         # Restore MinHash state
         minhash_data = data.get("minhash", {})
         if minhash_data and _HAS_DATASKETCH:
             import numpy as np
 
+            # Signatures are raw bytes of the writer's hashvalues array; the
+            # dtype differs across datasketch versions (uint64 vs uint32)
+            dtype = np.dtype(
+                data.get("minhash_dtype") or self._empty_minhash.hashvalues.dtype
+            )
             self._lsh = MinHashLSH(threshold=self.LSH_THRESHOLD, num_perm=self.NUM_PERM)
             self._minhashes = {}
             self._doc_counter = 0
-            for key, hex_digest in minhash_data.items():
-                m = MinHash(num_perm=self.NUM_PERM)
-                m.hashvalues = np.frombuffer(bytes.fromhex(hex_digest), dtype=np.uint64).copy()
+            for key, digest in minhash_data.items():
+                m = self._empty_minhash.copy()
+                m.hashvalues = np.frombuffer(digest, dtype=dtype).astype(
+                    m.hashvalues.dtype
+                )
                 self._lsh.insert(key, m)
                 self._minhashes[key] = m
                 self._doc_counter = max(self._doc_counter, int(key) + 1)
+
+    @staticmethod
+    def _decode_legacy_json(raw: bytes) -> dict:
+        """Convert a pre-pickle JSON state file to the in-memory layout."""
+        data = json.loads(raw)
+        data["urls"] = {int(h, 16) for h in data.get("urls", [])}
+        data["content"] = {int(h, 16) for h in data.get("content", [])}
+        data["minhash"] = {
+            k: bytes.fromhex(v) for k, v in data.get("minhash", {}).items()
+        }
+        return data
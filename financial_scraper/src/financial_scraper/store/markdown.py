@@ -1,119 +1,140 @@
 """Markdown writer for combined and individual article output."""
 
+import itertools
 import logging
 import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
+_MAX_WRITE_WORKERS = 16
+_ALNUM_RUN_RE = re.compile(r"[a-z0-9]+")
+
 
 def _slugify(text: str, max_len: int = 40) -> str:
     """Lowercase, replace non-alphanumeric with underscore, truncate."""
-    slug = text.lower().strip()
-    slug = re.sub(r"[^a-z0-9]+", "_", slug)
-    slug = slug.strip("_")
-    return slug[:max_len]
+    # Joining the alphanumeric runs collapses separators and drops
+    # leading/trailing ones in a single pass
+    return "_".join(_ALNUM_RUN_RE.findall(text.lower()))[:max_len]
 
 
-def _word_count(text: str) -> int:
-    return len(text.split())
+def _word_count(text: str | None) -> int:
+    return len(text.split()) if text else 0
 
 
-def format_record_md(record: dict, include_query: bool = True) -> str:
-    """Format a single record dict as a standalone markdown article."""
+def _meta_lines(source: str, url: str, date: str, words: int) -> Iterator[str]:
+    """Metadata table rows shared by the single and combined formats."""
+    yield "| | |"
+    yield "|---|---|"
+    if source:
+        yield f"| **Source** | {source} |"
+    if url:
+        yield f"| **URL** | {url} |"
+    if date:
+        yield f"| **Date** | {date} |"
+    yield f"| **Words** | {words:,} |"
+
+
+def iter_record_md(
+    record: dict, include_query: bool = True, word_count: int | None = None,
+) -> Iterator[str]:
+    """Yield the lines of a single record as a standalone markdown article.
+
+    ``word_count`` lets callers that already counted the text skip a recount.
+    """
     title = record.get("title") or "Untitled"
-    source = record.get("source", "")
-    url = record.get("link", "")
-    date = record.get("date", "")
     text = record.get("full_text", "")
     query = record.get("company", "")
-    words = _word_count(text) if text else 0
-
-    lines = [f"# {title}", ""]
+    words = word_count if word_count is not None else _word_count(text)
 
-    # Metadata table
-    lines.append("| | |")
-    lines.append("|---|---|")
-    if source:
-        lines.append(f"| **Source** | {source} |")
-    if url:
-        lines.append(f"| **URL** | {url} |")
-    if date:
-        lines.append(f"| **Date** | {date} |")
-    lines.append(f"| **Words** | {words:,} |")
+    yield f"# {title}"
+    yield ""
+    yield from _meta_lines(
+        record.get("source", ""), record.get("link", ""), record.get("date", ""), words,
+    )
     if include_query and query:
-        lines.append(f"| **Query** | {query} |")
-
-    lines.append("")
+        yield f"| **Query** | {query} |"
+    yield ""
     if text:
-        lines.append(text)
-    lines.append("")
+        yield text
+    yield ""
+
+
+def format_record_md(record: dict, include_query: bool = True) -> str:
+    """Format a single record dict as a standalone markdown article."""
+    return "\n".join(iter_record_md(record, include_query))
 
-    return "\n".join(lines)
 
+def iter_records_md(
+    records: list[dict], word_counts: list[int] | None = None,
+) -> Iterator[str]:
+    """Yield the lines of a combined markdown document, grouped by query.
 
-def format_records_md(records: list[dict]) -> str:
-    """Format multiple records as a combined markdown document, grouped by query."""
+    ``word_counts``, if given, holds the precomputed count for each record.
+    """
     if not records:
-        return ""
+        return
+    if word_counts is None:
+        word_counts = [_word_count(r.get("full_text", "")) for r in records]
 
     # Gather stats
-    queries = set()
-    sources = set()
-    for r in records:
-        if r.get("company"):
-            queries.add(r["company"])
-        if r.get("source"):
-            sources.add(r["source"])
+    sources = {r["source"] for r in records if r.get("source")}
 
     today = datetime.now().strftime("%Y-%m-%d")
-    lines = [
-        "# Financial Scraper Report",
-        "",
-        f"> {len(records)} articles \u00b7 {len(sources)} sources \u00b7 {today}",
-        "",
-    ]
-
-    # Group by query (company field)
-    from collections import OrderedDict
-    groups: OrderedDict[str, list[dict]] = OrderedDict()
-    for r in records:
-        key = r.get("company", "")
-        groups.setdefault(key, []).append(r)
+    yield "# Financial Scraper Report"
+    yield ""
+    yield f"> {len(records)} articles \u00b7 {len(sources)} sources \u00b7 {today}"
+    yield ""
+
+    # Group by query (company field), preserving first-seen order
+    groups: dict[str, list[tuple[dict, int]]] = {}
+    for r, words in zip(records, word_counts):
+        groups.setdefault(r.get("company", ""), []).append((r, words))
 
     for query, group in groups.items():
-        lines.append("---")
-        lines.append("")
+        yield "---"
+        yield ""
         if query:
-            lines.append(f"## {query}")
-            lines.append("")
-
-        for r in group:
-            title = r.get("title") or "Untitled"
-            source = r.get("source", "")
-            url = r.get("link", "")
-            date = r.get("date", "")
+            yield f"## {query}"
+            yield ""
+
+        for r, words in group:
             text = r.get("full_text", "")
-            words = _word_count(text) if text else 0
-
-            lines.append(f"### {title}")
-            lines.append("")
-            lines.append("| | |")
-            lines.append("|---|---|")
-            if source:
-                lines.append(f"| **Source** | {source} |")
-            if url:
-                lines.append(f"| **URL** | {url} |")
-            if date:
-                lines.append(f"| **Date** | {date} |")
-            lines.append(f"| **Words** | {words:,} |")
-            lines.append("")
+
+            yield f"### {r.get('title') or 'Untitled'}"
+            yield ""
+            yield from _meta_lines(
+                r.get("source", ""), r.get("link", ""), r.get("date", ""), words,
+            )
+            yield ""
             if text:
-                lines.append(text)
-            lines.append("")
+                yield text
+            yield ""
+
 
-    return "\n".join(lines)
+def format_records_md(records: list[dict]) -> str:
+    """Format multiple records as a combined markdown document, grouped by query."""
+    return "\n".join(iter_records_md(records))
+
+
+def _write_lines(f: TextIO, lines: Iterable[str]) -> None:
+    """Write *lines* newline-joined without materializing the joined string."""
+    first = True
+    for line in lines:
+        if not first:
+            f.write("\n")
+        f.write(line)
+        first = False
+
+
+def _write_record_file(filepath: Path, record: dict, word_count: int) -> None:
+    with open(filepath, "w", encoding="utf-8") as f:
+        _write_lines(f, iter_record_md(record, include_query=True, word_count=word_count))
 
 
 class MarkdownWriter:
@@ -122,46 +143,46 @@ class MarkdownWriter:
     def __init__(self, path: Path):
         self._path = Path(path)
         self._md_dir = self._path.parent / "markdown"
-        self._counter: dict[str, int] = {}  # per-query slug counter
+        self._counter: Counter[str] = Counter()  # per-query slug counter
 
     def append(self, records: list[dict]) -> None:
         if not records:
             return
 
-        # 1. Append to combined file
-        block = format_records_md(records)
+        # Count words once; both the combined and the per-article output use it
+        word_counts = [_word_count(r.get("full_text", "")) for r in records]
+
+        # 1. Append to combined file, streaming lines instead of building one string
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        lines = iter_records_md(records, word_counts)
 
         if self._path.exists():
-            # Append just the article sections — strip the repeated report header
-            # The header is the first 3 lines: "# Financial Scraper Report", "", "> N articles..."
-            lines = block.split("\n")
-            # Find where the content sections start (after the header block)
-            start = 0
-            for i, line in enumerate(lines):
-                if line.startswith("---"):
-                    start = i
-                    break
-            body = "\n".join(lines[start:])
+            # Append just the article sections — skip the repeated report
+            # header, i.e. everything before the first "---" separator
+            body = itertools.dropwhile(lambda line: not line.startswith("---"), lines)
             with open(self._path, "a", encoding="utf-8") as f:
-                f.write("\n" + body)
+                f.write("\n")
+                _write_lines(f, body)
         else:
             with open(self._path, "w", encoding="utf-8") as f:
-                f.write(block)
+                _write_lines(f, lines)
 
         logger.info(f"Wrote {len(records)} articles to {self._path}")
 
-        # 2. Write individual files
+        # 2. Write individual files — number them sequentially, then overlap
+        # the file-create/write syscalls across a small thread pool
         self._md_dir.mkdir(parents=True, exist_ok=True)
-        for r in records:
-            query = r.get("company", "unknown")
-            slug = _slugify(query)
-            self._counter[slug] = self._counter.get(slug, 0) + 1
-            idx = self._counter[slug]
-            filename = f"{slug}_{idx:03d}.md"
-            filepath = self._md_dir / filename
-            content = format_record_md(r, include_query=True)
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
+        jobs: list[tuple[Path, dict, int]] = []
+        for r, words in zip(records, word_counts):
+            slug = _slugify(r.get("company", "unknown"))
+            self._counter[slug] += 1
+            jobs.append((self._md_dir / f"{slug}_{self._counter[slug]:03d}.md", r, words))
+
+        if len(jobs) == 1:
+            _write_record_file(*jobs[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_WRITE_WORKERS, len(jobs))) as pool:
+                # list() re-raises the first write error, if any
+                list(pool.map(lambda job: _write_record_file(*job), jobs))
 
         logger.info(f"Wrote {len(records)} individual files to {self._md_dir}")
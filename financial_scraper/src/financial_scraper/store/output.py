@@ -4,14 +4,20 @@ Output schema matches C:\\_DATA\\doc_parquet\\merged_by_year format:
   company, title, link, snippet, date (timestamp), source, full_text, source_file
 """
 
+import glob
 import json
 import logging
 import os
+import re
+import threading
+import time
+from collections.abc import Mapping, Sequence
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
@@ -28,16 +34,40 @@ SCHEMA = pa.schema([
     ("source_file", pa.string()),
 ])
 
+# Characters folded to "_" in source_file slugs, and the non-empty runs left over
+_SLUG_TABLE = str.maketrans(dict.fromkeys(" /-,.;:()[]{}", "_"))
+_SLUG_PART_RE = re.compile(r"[^_]+")
 
-def _parse_date(date_str: str | None) -> pd.Timestamp | None:
-    """Parse date string to pandas Timestamp for parquet timestamp[ns] column."""
+# Date layouts parsed by the vectorized strptime pass in ParquetWriter;
+# anything else falls back to _parse_date row by row
+_DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%Y-%m", "%Y")
+
+# Output-file metadata key listing the shards merged into it
+_MERGED_SHARDS_KEY = b"financial_scraper.merged_shards"
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str | None) -> datetime | None:
+    """Parse date string to a datetime for the parquet timestamp[ns] column.
+
+    ISO strings take the ``datetime.fromisoformat`` fast path; reduced
+    precision ("YYYY-MM", "YYYY") is handled explicitly, and anything else
+    falls back to ``pd.Timestamp`` (pandas is only imported for that case).
+    Cached because a batch usually repeats the same few dates.
+    """
     if not date_str:
         return None
-    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%Y-%m", "%Y"):
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    reduced_fmt = {4: "%Y", 7: "%Y-%m"}.get(len(date_str))
+    if reduced_fmt:
         try:
-            return pd.Timestamp(datetime.strptime(date_str, fmt))
+            return datetime.strptime(date_str, reduced_fmt)
         except ValueError:
-            continue
+            pass
+    import pandas as pd
     try:
         return pd.Timestamp(date_str)
     except Exception:
@@ -50,10 +80,8 @@ def make_source_file_tag(query: str, date_str: str | None, search_type: str) ->
     Mirrors the naming convention in merged_by_year (e.g. themename0001_gnews_2025Q4).
     """
     # Slugify the query: lowercase, replace spaces/special with _
-    slug = query.lower().strip()
-    for ch in " /-,.;:()[]{}":
-        slug = slug.replace(ch, "_")
-    slug = "_".join(part for part in slug.split("_") if part)[:40]
+    slug = query.lower().strip().translate(_SLUG_TABLE)
+    slug = "_".join(_SLUG_PART_RE.findall(slug))[:40]
 
     # Quarter from the article date or current date
     if date_str:
@@ -75,6 +103,33 @@ def make_source_file_tag(query: str, date_str: str | None, search_type: str) ->
     return f"{slug}_{mode}_{quarter_tag}.parquet"
 
 
+def _date_array(values: list) -> pa.Array:
+    """Convert raw date values to a timestamp[ns] array.
+
+    Strings in one of ``_DATE_FORMATS`` are parsed with vectorized
+    ``pyarrow.compute.strptime`` kernels; datetimes pass through and any
+    remaining strings (offsets, fractional seconds, free-form) go through
+    ``_parse_date``.
+    """
+    strings = pa.array(
+        [v if isinstance(v, str) and v else None for v in values], type=pa.string()
+    )
+    parsed = pc.coalesce(*[
+        pc.strptime(strings, format=fmt, unit="ns", error_is_null=True)
+        for fmt in _DATE_FORMATS
+    ])
+    unparsed = parsed.null_count - strings.null_count
+    has_datetimes = any(isinstance(v, datetime) for v in values)
+    if not unparsed and not has_datetimes:
+        return parsed
+
+    merged = parsed.to_pylist()
+    for i, v in enumerate(values):
+        if merged[i] is None and v:
+            merged[i] = v if isinstance(v, datetime) else _parse_date(v)
+    return pa.array(merged, type=SCHEMA.field("date").type)
+
+
 def _current_quarter_tag() -> str:
     now = datetime.now()
     q = (now.month - 1) // 3 + 1
@@ -82,51 +137,206 @@ def _current_quarter_tag() -> str:
 
 
 class ParquetWriter:
-    """Append-mode Parquet writer (merged_by_year compatible)."""
+    """Append-mode Parquet writer (merged_by_year compatible).
+
+    Each ``append()`` streams one row group into an open shard file, so
+    nothing already on disk is re-read while a run is in progress.
+    ``flush()`` seals the shard (footer written, renamed to ``*.part``) so
+    its rows survive a kill; pipelines register it with their checkpoint so
+    rows are on disk before progress is recorded. ``close()`` merges the
+    existing output and every sealed shard into the output path once, row
+    group by row group. Shards left by a killed run are picked up and merged
+    by the next writer for the same path. Use as a context manager or call
+    ``close()`` when done.
+    """
 
     def __init__(self, path: Path):
         self._path = Path(path)
+        self._tmp = self._path.with_suffix(".parquet.tmp")
+        # Hex nanosecond stamp: shard names sort in write order across runs
+        self._run = f"{time.time_ns():016x}"
+        self._seq = 0
+        self._writer: pq.ParquetWriter | None = None
+        self._shard_tmp: Path | None = None
+        self._shards = self._recover_shards()
+        self._rows = sum(
+            pq.ParquetFile(p).metadata.num_rows
+            for p in [self._path, *self._shards] if p.exists()
+        )
+        # Guards the open shard: asave() flushes from a worker thread while
+        # the event loop may be appending.
+        self._lock = threading.Lock()
+        self._flush_requested = False
 
     def append(self, records: list[dict]):
         if not records:
             return
-        # Ensure all fields present with defaults
-        for r in records:
-            for field in SCHEMA:
-                if field.name not in r:
-                    if field.type == pa.timestamp("ns"):
-                        r[field.name] = None
-                    else:
-                        r[field.name] = ""
-
-        # Build DataFrame so we can use pandas Timestamp for the date column
-        df = pd.DataFrame(records)
-        # Coerce date column to datetime
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+        self._write(self._to_table(records))
 
+    def append_columns(self, columns: Mapping[str, Sequence]):
+        """Append a columnar batch: one equal-length sequence per field.
+
+        Producers that already hold data column-wise skip the per-record
+        dicts entirely. Missing columns are filled with "" (null for date).
+        """
+        n = len(next(iter(columns.values()), ()))
+        if not n:
+            return
+        self._write(self._columns_to_table(columns, n))
+
+    def _write(self, table: pa.Table):
+        with self._lock:
+            if self._writer is None:
+                self._open()
+            self._writer.write_table(table)
+            self._rows += len(table)
+        logger.info(f"Appended {len(table)} rows to {self._path} (total: {self._rows})")
+        if self._flush_requested:
+            self.flush()
+
+    @classmethod
+    def _to_table(cls, records: list[dict]) -> pa.Table:
+        """Transpose records into columns and build the Arrow table."""
+        columns = {
+            name: [r.get(name, "") for r in records] for name in SCHEMA.names
+        }
+        return cls._columns_to_table(columns, len(records))
+
+    @staticmethod
+    def _columns_to_table(columns: Mapping[str, Sequence], n: int) -> pa.Table:
+        """Build the Arrow table with one array per column (no pandas round-trip).
+
+        Dates are parsed by ``_date_array`` and unparseable values become null.
+        """
+        arrays = []
+        for field in SCHEMA:
+            values = columns.get(field.name)
+            if field.name == "date":
+                arrays.append(
+                    _date_array(list(values)) if values is not None
+                    else pa.nulls(n, type=field.type)
+                )
+            elif values is None:
+                arrays.append(pa.array([""] * n, type=field.type))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+    def flush(self):
+        """Seal the rows written since the last flush into a ``*.part`` shard.
+
+        Costs one footer write and a rename; the next append opens a new
+        shard. Safe to call from a worker thread or a signal handler.
+        """
+        # Signal handlers run on the main thread, possibly in the middle of
+        # a write holding the lock: defer to that call instead of deadlocking
+        # (_write flushes once the interrupted batch is complete).
+        blocking = threading.current_thread() is not threading.main_thread()
+        if not self._lock.acquire(blocking=blocking):
+            self._flush_requested = True
+            return
+        try:
+            self._flush_requested = False
+            self._seal()
+        finally:
+            self._lock.release()
+
+    def _seal(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        shard = self._shard_tmp.with_suffix("")
+        os.replace(self._shard_tmp, shard)
+        self._shards.append(shard)
+        logger.debug(f"Sealed {shard.name} ({self._rows} rows in total)")
+
+    def close(self):
+        """Seal the open shard and merge all shards into the output path."""
+        with self._lock:
+            self._seal()
+            if self._shards:
+                self._merge()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        self._seq += 1
+        self._shard_tmp = self._path.with_name(
+            f"{self._path.name}.{self._run}-{self._seq:05d}.part.tmp"
+        )
+        self._writer = pq.ParquetWriter(self._shard_tmp, SCHEMA, compression="snappy")
+
+    def _recover_shards(self) -> list[Path]:
+        """Sealed shards from earlier runs that never reached the output.
+
+        Unsealed ``*.part.tmp`` files (and a half-merged output ``.tmp``)
+        have no footer and hold only rows whose progress was never
+        checkpointed, so they are dropped. Shards the output already lists
+        as merged are leftovers of a close() killed before cleanup.
+        """
+        pattern = glob.escape(self._path.name) + ".*.part"
+        for stale in self._path.parent.glob(pattern + ".tmp"):
+            stale.unlink(missing_ok=True)
+        self._tmp.unlink(missing_ok=True)
+        merged = set()
         if self._path.exists():
-            existing = self._read_with_retry(self._path)
-            combined = pa.concat_tables([existing, table], promote_options="permissive")
-        else:
-            combined = table
+            meta = pq.read_schema(self._path).metadata or {}
+            merged = set(json.loads(meta.get(_MERGED_SHARDS_KEY, b"[]")))
+        shards = []
+        for shard in sorted(self._path.parent.glob(pattern)):
+            if shard.name in merged:
+                shard.unlink(missing_ok=True)
+            else:
+                shards.append(shard)
+        return shards
 
-        # Atomic write: write to .tmp then replace
-        tmp = self._path.with_suffix(".parquet.tmp")
-        pq.write_table(combined, tmp, compression="snappy")
-        os.replace(tmp, self._path)
-        logger.info(f"Appended {len(records)} rows to {self._path} (total: {len(combined)})")
+    def _merge(self):
+        """Rewrite the output as existing rows + shards, one row group at a time.
+
+        The shard names are stored in the output's metadata, so shards that
+        outlive a kill between the replace and their deletion are not merged
+        twice.
+        """
+        sources = [self._path, *self._shards] if self._path.exists() else self._shards
+        schema = SCHEMA.with_metadata({
+            _MERGED_SHARDS_KEY: json.dumps([s.name for s in self._shards]),
+        })
+        with pq.ParquetWriter(self._tmp, schema, compression="snappy") as writer:
+            for src in sources:
+                pf = self._open_with_retry(src)
+                for i in range(pf.num_row_groups):
+                    writer.write_table(self._conform(pf.read_row_group(i)))
+        os.replace(self._tmp, self._path)
+        for shard in self._shards:
+            shard.unlink(missing_ok=True)
+        logger.debug(f"Merged {len(self._shards)} shards into {self._path}")
+        self._shards = []
+
+    @staticmethod
+    def _conform(table: pa.Table) -> pa.Table:
+        """Cast an existing file to SCHEMA; columns it predates become null."""
+        arrays = [
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(len(table), type=field.type)
+            for field in SCHEMA
+        ]
+        return pa.Table.from_arrays(arrays, schema=SCHEMA)
 
     @staticmethod
-    def _read_with_retry(path: Path, attempts: int = 3) -> pa.Table:
-        """Read parquet with retries for transient Windows file locks."""
-        import time
+    def _open_with_retry(path: Path, attempts: int = 3) -> pq.ParquetFile:
+        """Open parquet with retries for transient Windows file locks."""
         for attempt in range(attempts):
             try:
-                return pq.read_table(path)
+                return pq.ParquetFile(path)
             except (OSError, pa.ArrowInvalid) as e:
                 if attempt < attempts - 1:
-                    logger.warning("Parquet read failed (attempt %d/%d): %s", attempt + 1, attempts, e)
+                    logger.warning("Parquet open failed (attempt %d/%d): %s", attempt + 1, attempts, e)
                     time.sleep(1.0 * (attempt + 1))
                 else:
                     raise
@@ -142,6 +352,10 @@ class JSONLWriter:
         if not records:
             return
         with open(self._path, "a", encoding="utf-8") as f:
-            for r in records:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
         logger.info(f"Appended {len(records)} records to {self._path}")
+
+    def append_columns(self, columns: Mapping[str, Sequence]):
+        """Append a columnar batch (see ``ParquetWriter.append_columns``)."""
+        names = list(columns)
+        self.append([dict(zip(names, row)) for row in zip(*columns.values())])
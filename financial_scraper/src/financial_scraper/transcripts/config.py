@@ -29,6 +29,7 @@ class TranscriptConfig:
     # Checkpoint
     checkpoint_file: Path = Path(".transcript_checkpoint.json")
     resume: bool = False
+    extract_cache_dir: Path | None = None  # per-URL extracted transcripts, reused across runs
 
     # Fallback source
     fmp_api_key: str = ""  # Financial Modeling Prep key; also read from FMP_API_KEY env var
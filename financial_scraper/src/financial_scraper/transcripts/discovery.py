@@ -1,10 +1,11 @@
 """Discover earnings call transcript URLs from Motley Fool sitemaps.
 
-Uses lxml.etree for XML sitemap parsing (faster than BeautifulSoup).
+Uses lxml.etree.iterparse for streaming XML sitemap parsing (faster than BeautifulSoup).
 """
 
 import logging
 import re
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -48,11 +49,12 @@ _SLUG_RE = re.compile(
     r"(?P<pub_year>\d{4})/(?P<pub_month>\d{2})/(?P<pub_day>\d{2})/"
     r"(?P<company>.+?)-(?P<ticker>[a-z]+(?:-[a-z])?)-"
     r"(?:q(?P<quarter>\d)-)?"
-    r"(?P<fiscal_year>\d{4})-earnings"
+    r"(?P<fiscal_year>\d{4})-earnings",
+    re.ASCII,
 )
 
-_SITEMAP_NS = {"s": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-_SITEMAP_NS_GOOGLE = {"s": "http://www.google.com/schemas/sitemap/0.84"}
+# Class-share ticker in upper case, e.g. "BRK-A"
+_CLASS_TICKER_RE = re.compile(r"[A-Z]+-[A-Z]", re.ASCII)
 
 
 @dataclass(frozen=True, slots=True)
@@ -73,7 +75,7 @@ def _normalize_ticker(slug: str) -> str:
     """
     upper = slug.upper()
     # Single-letter suffix after hyphen = class share (BRK-A -> BRK.A)
-    if re.fullmatch(r"[A-Z]+-[A-Z]", upper):
+    if _CLASS_TICKER_RE.fullmatch(upper):
         return upper.replace("-", ".")
     return upper
 
@@ -104,37 +106,86 @@ def _parse_transcript_url(url: str) -> TranscriptInfo | None:
 
 
 def _parse_sitemap_xml(content: str | bytes) -> list[str]:
-    """Extract all <loc> URLs from sitemap XML using lxml.etree."""
+    """Extract all <loc> URLs from sitemap XML using lxml.etree.iterparse.
+
+    Streams the document: each <loc> is cleared once read, and the
+    <url>/<sitemap> entries before the current one are detached from the
+    root, so memory stays bounded by one entry rather than the whole tree.
+    ``{*}loc`` matches <loc> in any sitemap namespace variant, or none.
+    """
+    from io import BytesIO
+
     from lxml import etree
 
     if isinstance(content, str):
         content = content.encode("utf-8")
 
+    urls: list[str] = []
     try:
-        root = etree.fromstring(content)
+        for _, elem in etree.iterparse(BytesIO(content), tag="{*}loc"):
+            if elem.text:
+                urls.append(elem.text)
+            elem.clear()
+            entry = elem.getparent()
+            if entry is None:
+                continue
+            while elem.getprevious() is not None:
+                del entry[0]
+            parent = entry.getparent()
+            if parent is not None:
+                while entry.getprevious() is not None:
+                    del parent[0]
     except etree.XMLSyntaxError:
         return []
+    return urls
 
-    # Try multiple sitemap namespace variants
-    locs = root.findall(".//s:loc", _SITEMAP_NS)
-    if not locs:
-        locs = root.findall(".//s:loc", _SITEMAP_NS_GOOGLE)
-    if not locs:
-        locs = root.findall(".//{http://www.sitemaps.org/schemas/sitemap/0.9}loc")
-    if not locs:
-        locs = root.findall(".//{http://www.google.com/schemas/sitemap/0.84}loc")
-    if not locs:
-        locs = root.findall(".//loc")
 
-    return [loc.text for loc in locs if loc.text]
+# Successfully fetched sitemaps, keyed by (year, month). Shared across calls
+# so per-ticker discovery doesn't refetch the same monthly sitemaps for every
+# ticker. Failures are never cached. Entries for closed months never expire;
+# the current (or a future) month is still being published to, so its entry
+# expires after _OPEN_MONTH_TTL seconds and long-lived processes see new
+# transcripts. Values are (monotonic expiry or None, urls).
+_OPEN_MONTH_TTL = 3600.0
+_sitemap_cache: dict[tuple[int, int], tuple[float | None, tuple[str, ...]]] = {}
+# Per-sitemap ticker -> transcripts index, built once from the cached URLs
+_index_cache: dict[tuple[int, int], dict[str, list[TranscriptInfo]]] = {}
+
+
+def clear_sitemap_cache() -> None:
+    """Drop all cached sitemap URL lists and their ticker indexes."""
+    _sitemap_cache.clear()
+    _index_cache.clear()
+
+
+def _month_is_closed(year: int, month: int) -> bool:
+    now = datetime.now()
+    return (year, month) < (now.year, now.month)
+
+
+def _cached_sitemap(key: tuple[int, int]) -> tuple[str, ...] | None:
+    """Cached URLs for a sitemap, or None if absent or expired."""
+    entry = _sitemap_cache.get(key)
+    if entry is None:
+        return None
+    expires, urls = entry
+    if expires is not None and time.monotonic() >= expires:
+        _sitemap_cache.pop(key, None)
+        _index_cache.pop(key, None)
+        return None
+    return urls
 
 
 def _fetch_sitemap_urls(year: int, month: int) -> list[str]:
     """Fetch all URLs from a Motley Fool monthly sitemap.
 
     Retries up to 3 times on HTTP 429 with exponential backoff (5s, 10s).
+    Successful results are cached per process (see ``_sitemap_cache``);
+    the current month's entry expires after ``_OPEN_MONTH_TTL`` seconds.
     """
-    import time as _time
+    cached = _cached_sitemap((year, month))
+    if cached is not None:
+        return list(cached)
     url = SITEMAP_URL.format(year=year, month=month)
     for attempt in range(3):
         try:
@@ -153,23 +204,56 @@ def _fetch_sitemap_urls(year: int, month: int) -> list[str]:
                 f"Sitemap 429 for {year}-{month:02d} (attempt {attempt+1}/3), "
                 f"backing off {wait}s"
             )
-            _time.sleep(wait)
+            time.sleep(wait)
             continue
 
         if resp.status_code != 200:
             logger.warning(f"Sitemap {url} returned {resp.status_code}")
             return []
 
-        return _parse_sitemap_xml(resp.text)
+        urls = _parse_sitemap_xml(resp.text)
+        expires = None if _month_is_closed(year, month) else time.monotonic() + _OPEN_MONTH_TTL
+        _sitemap_cache[(year, month)] = (expires, tuple(urls))
+        return urls
 
     logger.warning(f"Sitemap {year}-{month:02d} failed after 3 attempts (persistent 429)")
     return []
 
 
+def _index_transcripts(urls: list[str]) -> dict[str, list[TranscriptInfo]]:
+    """Group a sitemap's transcript URLs by ticker (one regex pass per URL)."""
+    index: dict[str, list[TranscriptInfo]] = {}
+    for url in urls:
+        if TRANSCRIPT_PATH not in url:
+            continue
+        info = _parse_transcript_url(url)
+        if info is not None:
+            index.setdefault(info.ticker, []).append(info)
+    return index
+
+
+def _sitemap_index(year: int, month: int) -> dict[str, list[TranscriptInfo]]:
+    """Ticker -> TranscriptInfo index for one monthly sitemap.
+
+    Cached alongside the raw URL list, so each sitemap is parsed once no
+    matter how many tickers look it up.
+    """
+    key = (year, month)
+    if _cached_sitemap(key) is not None:  # index expires with its sitemap
+        cached = _index_cache.get(key)
+        if cached is not None:
+            return cached
+    index = _index_transcripts(_fetch_sitemap_urls(year, month))
+    if key in _sitemap_cache:  # only cache successful fetches
+        _index_cache[key] = index
+    return index
+
+
 def discover_transcripts(
     ticker: str,
     year: int | None = None,
     quarters: tuple[str, ...] = (),
+    sitemap_workers: int = 4,
 ) -> list[TranscriptInfo]:
     """Discover transcript URLs for a ticker by scanning Motley Fool sitemaps.
 
@@ -180,6 +264,7 @@ def discover_transcripts(
         ticker: Stock ticker symbol (e.g. "AAPL")
         year: Fiscal year to search for (default: current year)
         quarters: Filter to specific quarters (e.g. ("Q1", "Q4")). Empty = all.
+        sitemap_workers: Parallel sitemap fetch threads (default: 4).
 
     Returns:
         List of TranscriptInfo with matching URLs, deduplicated.
@@ -188,7 +273,6 @@ def discover_transcripts(
         year = datetime.now().year
 
     ticker_upper = ticker.upper()
-    ticker_slug = _ticker_to_slug(ticker)
 
     # Scan sitemaps for the prior year, target year, and next year.
     # Companies with fiscal years offset from the calendar year (e.g. NVIDIA,
@@ -212,24 +296,16 @@ def discover_transcripts(
     seen_urls: set[str] = set()
     results: list[TranscriptInfo] = []
 
-    for y, m in months_to_scan:
-        all_urls = _fetch_sitemap_urls(y, m)
-        # Fast filter: only transcript URLs containing the ticker slug
-        transcript_urls = [
-            u for u in all_urls
-            if TRANSCRIPT_PATH in u and f"-{ticker_slug}-" in u.lower()
-        ]
+    # Sitemap fetches are network-bound; map() keeps month order for dedup
+    with ThreadPoolExecutor(max_workers=max(1, sitemap_workers)) as executor:
+        indexes = list(executor.map(lambda ym: _sitemap_index(*ym), months_to_scan))
 
-        for url in transcript_urls:
-            if url in seen_urls:
+    for index in indexes:
+        for info in index.get(ticker_upper, ()):
+            if info.url in seen_urls:
                 continue
-            seen_urls.add(url)
+            seen_urls.add(info.url)
 
-            info = _parse_transcript_url(url)
-            if info is None:
-                continue
-            if info.ticker != ticker_upper:
-                continue
             if info.year != year:
                 continue
             if quarters and info.quarter not in quarters:
@@ -282,7 +358,6 @@ def discover_transcripts_range(
             logger.warning(f"Failed to load discovery cache ({e}), re-scanning sitemaps")
     now = datetime.now()
     ticker_upper_set = {t.upper() for t in tickers}
-    ticker_slug_set = {_ticker_to_slug(t) for t in tickers}
 
     # Months to scan: one year before from_year through one year after to_year,
     # capped at the current calendar month (no future sitemaps exist).
@@ -302,26 +377,16 @@ def discover_transcripts_range(
 
     def _fetch_and_filter(year_month: tuple[int, int]) -> list[TranscriptInfo]:
         """Worker: fetch one sitemap, return matching TranscriptInfo items."""
-        y, m = year_month
-        all_urls = _fetch_sitemap_urls(y, m)
+        index = _sitemap_index(*year_month)
         matched: list[TranscriptInfo] = []
-        for url in all_urls:
-            if TRANSCRIPT_PATH not in url:
-                continue
-            url_lower = url.lower()
-            # Fast pre-filter: skip URLs that don't contain any known ticker slug
-            if not any(f"-{t}-" in url_lower for t in ticker_slug_set):
-                continue
-            info = _parse_transcript_url(url)
-            if info is None:
-                continue
-            if info.ticker not in ticker_upper_set:
-                continue
-            if not (from_year <= info.year <= to_year):
-                continue
-            if quarters and info.quarter not in quarters:
-                continue
-            matched.append(info)
+        # Index lookup instead of substring-matching every ticker per URL
+        for ticker in ticker_upper_set & index.keys():
+            for info in index[ticker]:
+                if not (from_year <= info.year <= to_year):
+                    continue
+                if quarters and info.quarter not in quarters:
+                    continue
+                matched.append(info)
         return matched
 
     # Collect results in the main thread (no shared-state races)
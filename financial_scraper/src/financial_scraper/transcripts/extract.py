@@ -8,6 +8,7 @@ import logging
 import re
 from dataclasses import dataclass, field
 
+from lxml import etree
 from lxml import html as lxml_html
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,10 @@ _SPEAKER_DASH_RE = re.compile(r"^([A-Z][A-Za-z\s.\-']+?)\s*--\s*(.+)$")
 # Speaker line: "Name:" or "Name, Title:" (older format)
 _SPEAKER_COLON_RE = re.compile(r"^([A-Z][A-Za-z\s.\-']+?)(?:\s*,\s*[A-Za-z\s]+)?:")
 
+# Quarter / fiscal year in a headline like "Apple (AAPL) Q1 2025 Earnings Call"
+_HEADLINE_QUARTER_RE = re.compile(r"Q(\d)")
+_HEADLINE_YEAR_RE = re.compile(r"20\d{2}")
+
 # Common words that should not start a speaker name
 _NON_NAME_WORDS = frozenset({
     "A", "About", "After", "All", "Also", "An", "And", "Are", "As", "At",
@@ -31,6 +36,12 @@ _NON_NAME_WORDS = frozenset({
     "You", "Your",
 })
 
+# Precompiled XPath (cssselect would re-translate CSS to XPath on every call)
+_JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]')
+_ARTICLE_BODY_XPATH = etree.XPath(
+    '//div[contains(concat(" ", normalize-space(@class), " "), " article-body ")]'
+)
+
 # Heading normalization — strip colons, whitespace, lowercase for matching
 def _norm_heading(text: str) -> str:
     return text.strip().rstrip(":").strip().upper()
@@ -42,6 +53,30 @@ _PARTICIPANTS = {"CALL PARTICIPANTS"}
 _CONTENTS = {"CONTENTS"}
 _FULL_TRANSCRIPT = {"FULL CONFERENCE CALL TRANSCRIPT"}
 
+# Normalized heading -> section kind collected by _walk_body
+_SECTION_KINDS = {
+    heading: kind
+    for kind, headings in (
+        ("participants", _PARTICIPANTS),
+        ("prepared", _PREPARED_REMARKS),
+        ("qa", _QA_SECTION),
+        ("full", _FULL_TRANSCRIPT),
+    )
+    for heading in headings
+}
+
+# Phrases that open the Q&A part of a transcript without an h2 heading, in
+# priority order. Searched with str.find on the lowercased text: CPython's
+# two-way substring search beats a compiled alternation even over 6 passes.
+_QA_MARKERS = (
+    "questions & answers",
+    "questions and answers",
+    "we will now begin the question",
+    "question-and-answer session",
+    "q&a session",
+    "open the line for questions",
+)
+
 
 @dataclass(slots=True)
 class TranscriptResult:
@@ -64,7 +99,7 @@ def _extract_json_ld(doc) -> dict:
     Args:
         doc: lxml HtmlElement (root of the parsed document).
     """
-    for script in doc.cssselect('script[type="application/ld+json"]'):
+    for script in _JSON_LD_XPATH(doc):
         try:
             text = script.text_content()
             if not text:
@@ -88,24 +123,32 @@ def _extract_ticker_from_jsonld(data: dict) -> str:
     return ""
 
 
-def _split_body_by_h2(body) -> dict[str, list]:
-    """Split article body into sections keyed by normalized h2 heading text.
+def _walk_body(body) -> dict[str, list]:
+    """Collect the known h2 sections of the article body in one pass.
 
-    Returns a dict mapping normalized heading -> list of sibling elements
-    between that h2 and the next h2.
+    Returns a dict mapping section kind ("participants", "prepared", "qa",
+    "full") -> list of sibling elements between that h2 and the next h2.
+    Children under any other heading are skipped as they are visited. When
+    several heading variants of one kind appear, the first variant wins; a
+    repeated heading replaces its earlier elements.
 
     Args:
         body: lxml HtmlElement for the article-body div.
     """
     sections: dict[str, list] = {}
-    current_key: str | None = None
+    headings: dict[str, str] = {}
+    current: list | None = None
 
     for child in body:
         if child.tag == "h2":
-            current_key = _norm_heading(child.text_content().strip())
-            sections[current_key] = []
-        elif current_key is not None:
-            sections[current_key].append(child)
+            key = _norm_heading(child.text_content())
+            kind = _SECTION_KINDS.get(key)
+            if kind is None or headings.setdefault(kind, key) != key:
+                current = None
+            else:
+                current = sections[kind] = []
+        elif current is not None:
+            current.append(child)
 
     return sections
 
@@ -121,14 +164,6 @@ def _section_text(elements: list) -> str:
     return "\n\n".join(paragraphs)
 
 
-def _find_section(sections: dict[str, list], headings: set[str]) -> list:
-    """Find a section by trying multiple heading variants."""
-    for key, elements in sections.items():
-        if key in headings:
-            return elements
-    return []
-
-
 def _extract_participants_from_elements(elements: list) -> list[str]:
     """Extract participant names from section elements.
 
@@ -139,53 +174,53 @@ def _extract_participants_from_elements(elements: list) -> list[str]:
     participants = []
     for el in elements:
         if el.tag == "ul":
-            for li in el.cssselect("li"):
+            for li in el.iter("li"):
                 text = li.text_content().strip()
                 if text:
                     participants.append(text)
         elif el.tag == "p":
-            strongs = el.cssselect("strong")
-            if strongs and strongs[0].text_content().strip():
+            strong = next(el.iter("strong"), None)
+            if strong is not None and strong.text_content().strip():
                 text = el.text_content().strip()
                 if text and len(text) < 200:
                     participants.append(text)
     return participants
 
 
-def _extract_speakers_from_elements(elements: list) -> list[str]:
+def _extract_speakers_from_elements(elements: list) -> dict[str, None]:
     """Extract unique speaker names from <strong> tags in section elements.
 
     In live Motley Fool HTML, speaker lines are:
       <p><strong>Name</strong> -- <em>Title</em></p>
     or just:
       <p><strong>Operator</strong></p>
+
+    Returns an insertion-ordered dict used as a set (first appearance wins).
     """
-    speakers = set()
+    speakers: dict[str, None] = {}
     for el in elements:
         if el.tag != "p":
             continue
-        strongs = el.cssselect("strong")
-        if not strongs:
+        strong = next(el.iter("strong"), None)
+        if strong is None:
             continue
-        strong = strongs[0]
-        # A speaker <p> has <strong> as its first meaningful child and
-        # the <strong> name is a large portion of the <p> text (not a bold
-        # word inside a long paragraph of speech)
-        text = el.text_content().strip()
         name = strong.text_content().strip()
-        if not name or len(name) <= 2:
-            continue
-        # Speaker <p> tags are short: "Name -- Title" or just "Name"
-        # Reject if <strong> text is less than 30% of <p> text (speech paragraph)
-        if len(name) < len(text) * 0.3:
+        if len(name) <= 2 or name in speakers:
             continue
         # Speaker names never contain colons (filters "Duration: 0 minutes" etc.)
         if ":" in name:
             continue
         # Filter names starting with common non-name words
-        first_word = name.split()[0] if name.split() else ""
-        if first_word not in _NON_NAME_WORDS:
-            speakers.add(name)
+        if name.split(None, 1)[0] in _NON_NAME_WORDS:
+            continue
+        # A speaker <p> has <strong> as its first meaningful child and
+        # the <strong> name is a large portion of the <p> text (not a bold
+        # word inside a long paragraph of speech). Speaker <p> tags are
+        # short: "Name -- Title" or just "Name". Reject if <strong> text is
+        # less than 30% of <p> text (speech paragraph)
+        if len(name) < len(el.text_content().strip()) * 0.3:
+            continue
+        speakers[name] = None
     return speakers
 
 
@@ -198,9 +233,10 @@ def _extract_speakers_from_text(text: str) -> list[str]:
     """
     speakers = set()
     for line in text.split("\n"):
-        line = line.strip()
-        if not line:
+        # No colon, no match: skips the lazy regex's scan of long speech lines
+        if ":" not in line:
             continue
+        line = line.strip()
 
         m = _SPEAKER_COLON_RE.match(line)
         if m:
@@ -215,31 +251,13 @@ def _extract_speakers_from_text(text: str) -> list[str]:
     return sorted(speakers)
 
 
-def _split_prepared_qa(
-    sections: dict[str, list], full_text: str,
-) -> tuple[str, str]:
-    """Split transcript into prepared remarks and Q&A.
+def _split_on_qa_marker(full_text: str) -> tuple[str, str]:
+    """Split transcript text into prepared remarks and Q&A at a text marker.
 
-    First tries h2-based section split, then falls back to text markers.
+    Fallback for pages without both "Prepared Remarks" and Q&A h2 sections.
     """
-    # Strategy 1: Use h2 section headings
-    prepared_els = _find_section(sections, _PREPARED_REMARKS)
-    qa_els = _find_section(sections, _QA_SECTION)
-
-    if prepared_els and qa_els:
-        return _section_text(prepared_els), _section_text(qa_els)
-
-    # Strategy 2: Text-based markers in the full text
-    markers = [
-        "questions & answers",
-        "questions and answers",
-        "we will now begin the question",
-        "question-and-answer session",
-        "q&a session",
-        "open the line for questions",
-    ]
     lower_text = full_text.lower()
-    for marker in markers:
+    for marker in _QA_MARKERS:
         idx = lower_text.find(marker)
         if idx != -1:
             return full_text[:idx].strip(), full_text[idx:].strip()
@@ -247,13 +265,30 @@ def _split_prepared_qa(
     return full_text, ""
 
 
-def extract_transcript(html: str) -> TranscriptResult | None:
+def extract_transcript(
+    html: str | bytes, encoding: str | None = None,
+) -> TranscriptResult | None:
     """Parse Motley Fool transcript HTML into structured result.
 
+    ``html`` may be the raw response body; bytes are decoded by libxml2
+    using ``encoding`` (or the page's own meta charset when None), which
+    skips building an intermediate Python str for the whole page.
+
     Returns None if the page doesn't contain a recognizable transcript.
     """
+    # Early reject before parsing: the body div's class must appear verbatim
+    marker = b"article-body" if isinstance(html, bytes) else "article-body"
+    if marker not in html:
+        logger.warning("No article-body div found")
+        return None
+
     try:
-        doc = lxml_html.fromstring(html)
+        if isinstance(html, bytes) and encoding:
+            doc = lxml_html.fromstring(
+                html, parser=lxml_html.HTMLParser(encoding=encoding)
+            )
+        else:
+            doc = lxml_html.fromstring(html)
     except Exception:
         logger.warning("Failed to parse HTML")
         return None
@@ -269,41 +304,45 @@ def extract_transcript(html: str) -> TranscriptResult | None:
         result.date = jsonld.get("datePublished", "")[:10]  # YYYY-MM-DD
 
     # 2. Find the article body
-    bodies = doc.cssselect("div.article-body")
+    bodies = _ARTICLE_BODY_XPATH(doc)
     if not bodies:
         logger.warning("No article-body div found")
         return None
     body = bodies[0]
 
-    # 3. Split body into h2-delimited sections
-    sections = _split_body_by_h2(body)
+    # 3. Collect the h2-delimited sections we use in a single pass
+    sections = _walk_body(body)
 
     # 4. Extract participants
-    participant_els = _find_section(sections, _PARTICIPANTS)
+    participant_els = sections.get("participants")
     if participant_els:
         result.participants = _extract_participants_from_elements(participant_els)
 
     # 5. Build full transcript text
     # Try "Prepared Remarks" + "Q&A" sections first (live format)
-    prepared_els = _find_section(sections, _PREPARED_REMARKS)
-    qa_els = _find_section(sections, _QA_SECTION)
+    prepared_els = sections.get("prepared", [])
+    qa_els = sections.get("qa", [])
+
+    # Section texts are computed once and reused for the prepared/Q&A split
+    prepared_text = _section_text(prepared_els) if prepared_els else ""
+    qa_text = _section_text(qa_els) if qa_els else ""
 
     if prepared_els or qa_els:
         parts = []
         if prepared_els:
-            parts.append(_section_text(prepared_els))
+            parts.append(prepared_text)
         if qa_els:
-            parts.append(_section_text(qa_els))
+            parts.append(qa_text)
         transcript_text = "\n\n".join(parts)
     else:
         # Try older "Full Conference Call Transcript" heading
-        full_els = _find_section(sections, _FULL_TRANSCRIPT)
+        full_els = sections.get("full")
         if full_els:
             transcript_text = _section_text(full_els)
         else:
             # Fallback: grab all <p> text from article body
             paragraphs = []
-            for p in body.cssselect("p"):
+            for p in body.iter("p"):
                 text = p.text_content().strip()
                 if text and len(text) > 20:
                     paragraphs.append(text)
@@ -313,26 +352,24 @@ def extract_transcript(html: str) -> TranscriptResult | None:
 
     # 6. Extract speakers — prefer HTML <strong> tags, fall back to text regex
     if prepared_els or qa_els:
-        html_speakers = set()
-        if prepared_els:
-            html_speakers |= _extract_speakers_from_elements(prepared_els)
-        if qa_els:
-            html_speakers |= _extract_speakers_from_elements(qa_els)
+        html_speakers = _extract_speakers_from_elements(prepared_els)
+        html_speakers.update(_extract_speakers_from_elements(qa_els))
         result.speakers = sorted(html_speakers)
     else:
         result.speakers = _extract_speakers_from_text(transcript_text)
 
-    # 7. Split into prepared remarks vs Q&A
-    result.prepared_remarks, result.qa_section = _split_prepared_qa(
-        sections, transcript_text,
-    )
+    # 7. Split into prepared remarks vs Q&A — h2 sections first, then text markers
+    if prepared_els and qa_els:
+        result.prepared_remarks, result.qa_section = prepared_text, qa_text
+    else:
+        result.prepared_remarks, result.qa_section = _split_on_qa_marker(transcript_text)
 
     # 8. Parse quarter/year from headline if not set
     if result.company and not result.quarter:
-        q_match = re.search(r"Q(\d)", result.company)
+        q_match = _HEADLINE_QUARTER_RE.search(result.company)
         if q_match:
             result.quarter = f"Q{q_match.group(1)}"
-        y_match = re.search(r"20\d{2}", result.company)
+        y_match = _HEADLINE_YEAR_RE.search(result.company)
         if y_match:
             result.year = int(y_match.group())
 
@@ -1,20 +1,27 @@
 """Transcript pipeline: discover -> fetch -> extract -> store."""
 
+import hashlib
+import json
 import logging
+import os
+import re
 import signal
 import threading
 import time
 from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
 from pathlib import Path
 from urllib.parse import urlparse
 
 from .config import TranscriptConfig
-from .discovery import discover_transcripts, discover_transcripts_range, TranscriptInfo
+from .discovery import (
+    USER_AGENT, discover_transcripts, discover_transcripts_range, TranscriptInfo,
+)
 from .extract import extract_transcript, TranscriptResult
 from .sources.fmp import FMPSource
 from ..store.dedup import Deduplicator
-from ..store.output import ParquetWriter, JSONLWriter, _parse_date
+from ..store.output import SCHEMA, ParquetWriter, JSONLWriter, _parse_date
 from ..checkpoint import Checkpoint
 from ..fetch.curl_client import CurlSession
 from ..fetch.proxy import ProxyRotator, auto_fetch_proxies
@@ -22,13 +29,51 @@ from ..fetch.throttle import SyncDomainThrottler
 
 logger = logging.getLogger(__name__)
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-)
-
 # Checkpoint save interval (seconds) — avoid saving after every single URL
 _CHECKPOINT_INTERVAL = 120
+# Records buffered across tickers before they are written (with a checkpoint
+# save) as one parquet row group
+_PARQUET_BATCH = 256
+_CHARSET_RE = re.compile(r"""charset=["']?([\w.:-]+)""", re.IGNORECASE)
+
+
+def _page_charset(headers) -> str:
+    """Charset declared in the Content-Type header, else UTF-8.
+
+    ``resp.encoding`` can't be used: the requests fallback reports ISO-8859-1
+    for any text/html without a charset. Leaving it to lxml is no better, as
+    it also reads undeclared bytes as latin-1 when the page has no
+    ``<meta charset>``. Transcript pages are served as UTF-8.
+    """
+    m = _CHARSET_RE.search(headers.get("content-type", ""))
+    return m.group(1) if m else "utf-8"
+
+
+def _cache_path(cache_dir: Path, url: str) -> Path:
+    return cache_dir / f"{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}.json"
+
+
+def _read_cached_result(cache_dir: Path, url: str) -> TranscriptResult | None:
+    """Load a previously extracted transcript for *url*, or None on a miss."""
+    try:
+        data = json.loads(_cache_path(cache_dir, url).read_bytes())
+        return TranscriptResult(**data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"  Ignoring unreadable extract cache entry for {url}: {e}")
+        return None
+
+
+def _write_cached_result(cache_dir: Path, url: str, result: TranscriptResult):
+    """Store an extracted transcript (atomic replace, so readers never see partial files)."""
+    path = _cache_path(cache_dir, url)
+    tmp = path.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps(asdict(result), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"  Failed to write extract cache for {url}: {e}")
 
 
 class TranscriptPipeline:
@@ -39,12 +84,18 @@ class TranscriptPipeline:
         self._dedup = Deduplicator()
         self._checkpoint = Checkpoint(config.checkpoint_file)
         self._parquet = ParquetWriter(config.output_path)
+        # Buffered records are written out only here, right before a
+        # checkpoint save marks their URLs as fetched.
+        self._checkpoint.flush_before_save(self._flush_output)
         self._jsonl = JSONLWriter(config.jsonl_path) if config.jsonl_path else None
         self._session = CurlSession(headers={"User-Agent": USER_AGENT})
         self._fmp = FMPSource(api_key=config.fmp_api_key)
         self._throttler = SyncDomainThrottler(
             base_delay=1.0, max_delay=60.0, max_per_domain=2,
         )
+        self._pending: dict[str, list] = {name: [] for name in SCHEMA.names}
+        if config.extract_cache_dir:
+            Path(config.extract_cache_dir).mkdir(parents=True, exist_ok=True)
         self._shutdown_requested = False
         self._browser = None
         self._proxy_rotator = None
@@ -86,7 +137,13 @@ class TranscriptPipeline:
             self._run_inner()
         finally:
             signal.signal(signal.SIGINT, original_handler)
+            # Rows still buffered (e.g. after an error) go out together with
+            # the checkpoint that marks their URLs, never on their own.
+            if self._pending["link"]:
+                self._checkpoint.save()
+            self._parquet.close()
             self._session.close()
+            self._fmp.close()
             if self._browser:
                 self._browser.close()
 
@@ -144,12 +201,10 @@ class TranscriptPipeline:
 
             stats["discovered"] += len(infos)
 
-            # Filter already-fetched
-            to_fetch = [
-                info for info in infos
-                if not self._checkpoint.is_url_fetched(info.url)
-                and not self._dedup.is_duplicate_url(info.url)
-            ]
+            # Filter already-fetched. Every extracted URL is marked in the
+            # checkpoint, so the Deduplicator only has to handle content.
+            fetched = self._checkpoint.fetched_urls
+            to_fetch = [info for info in infos if info.url not in fetched]
             skipped = len(infos) - len(to_fetch)
             if skipped:
                 logger.info(f"  Skipping {skipped} already-fetched transcript(s)")
@@ -157,17 +212,13 @@ class TranscriptPipeline:
             if not to_fetch:
                 continue
 
-            # Fetch and extract
-            records = self._fetch_and_extract(ticker, to_fetch, stats)
-            if records:
-                self._parquet.append(records)
-                if self._jsonl:
-                    self._jsonl.append(records)
-                total_records += len(records)
+            # Fetch and extract (records are buffered in _pending)
+            total_records += self._fetch_and_extract(ticker, to_fetch, stats)
 
-            self._checkpoint.save()
+            # Full rewrites scale with URLs seen; throttle them across tickers.
+            self._checkpoint.save_if_due(_CHECKPOINT_INTERVAL)
 
-        # 4. Final checkpoint save + Summary
+        # 4. Final checkpoint save (writes the remaining buffer) + Summary
         self._checkpoint.save()
         logger.info("\n" + "=" * 60)
         logger.info("TRANSCRIPT SUMMARY")
@@ -183,11 +234,14 @@ class TranscriptPipeline:
 
     def _fetch_and_extract(
         self, ticker: str, infos: list[TranscriptInfo], stats: Counter
-    ) -> list[dict]:
+    ) -> int:
         """Fetch transcript pages concurrently and extract content.
 
         Worker threads handle HTTP GET + extraction (pure I/O, no shared state).
         The main thread processes results: stats, checkpoint, dedup, record building.
+        Records are buffered column-wise in ``_pending`` (one list per output
+        field) and the checkpoint is saved as they accumulate, so a long
+        ticker still checkpoints mid-run. Returns the number of records.
         """
         session = self._session
         fmp = self._fmp
@@ -272,12 +326,15 @@ class TranscriptPipeline:
                 if proxy_rotator:
                     proxy_rotator.report_success(proxy)
 
-                result = extract_transcript(resp.text)
+                # Hand the raw body to lxml; no decoded str copy of the page
+                result = extract_transcript(
+                    resp.content, encoding=_page_charset(resp.headers),
+                )
                 if result is None or not result.full_text:
                     logger.warning(f"  Extraction failed for {info.url}")
                     return info, None, "extract_error"
 
-                time.sleep(1.0)
+                # Politeness is enforced by the shared throttler's send slots
                 return info, result, "success"
 
             # Fool.com permanently failed — try FMP fallback
@@ -285,18 +342,11 @@ class TranscriptPipeline:
                 logger.info(
                     f"  Trying FMP fallback for {info.ticker} {info.quarter} {info.year}"
                 )
-                # FMP uses its own HTTP client; pass a plain requests session
-                import requests
-                fmp_session = requests.Session()
-                try:
-                    fmp_result = fmp.get_transcript(
-                        info.ticker, info.quarter, info.year, fmp_session
-                    )
-                    if fmp_result and fmp_result.full_text:
-                        time.sleep(1.0)
-                        return info, fmp_result, "success"
-                finally:
-                    fmp_session.close()
+                # FMP uses its own pooled requests session, shared across workers
+                fmp_result = fmp.get_transcript(info.ticker, info.quarter, info.year)
+                if fmp_result and fmp_result.full_text:
+                    time.sleep(1.0)
+                    return info, fmp_result, "success"
 
             # Browser fallback
             if http_failed and browser:
@@ -309,11 +359,26 @@ class TranscriptPipeline:
 
             return info, None, "http_error"
 
-        records = []
+        cache_dir = self._config.extract_cache_dir
+        cache_dir = Path(cache_dir) if cache_dir else None
+
+        def _fetch_cached(info: TranscriptInfo):
+            """Worker: serve a cached extraction, else fetch and cache the result."""
+            cached = _read_cached_result(cache_dir, info.url)
+            if cached is not None:
+                logger.info(f"  Cached {info.quarter} {info.year}: {info.url}")
+                return info, cached, "success"
+            info, result, event = _fetch_one(info)
+            if event == "success":
+                _write_cached_result(cache_dir, info.url, result)
+            return info, result, event
+
+        worker = _fetch_cached if cache_dir else _fetch_one
+        n_records = 0
         concurrent = max(1, self._config.concurrent)
 
         with ThreadPoolExecutor(max_workers=concurrent) as executor:
-            futures = {executor.submit(_fetch_one, info): info for info in infos}
+            futures = {executor.submit(worker, info): info for info in infos}
             for future in as_completed(futures):
                 if self._shutdown_requested:
                     logger.warning("Shutdown requested — cancelling remaining fetches")
@@ -321,6 +386,9 @@ class TranscriptPipeline:
                         f.cancel()
                     break
 
+                # Each save writes _pending first, so rows and progress land together
+                self._checkpoint.save_if_due(_CHECKPOINT_INTERVAL)
+
                 try:
                     info, result, event = future.result()
                 except Exception as e:
@@ -345,11 +413,12 @@ class TranscriptPipeline:
                 # Successful extraction — shared state handled here (main thread only)
                 self._checkpoint.mark_url_fetched(info.url)
 
-                if self._dedup.is_duplicate_content(result.full_text):
+                dup, content_key = self._dedup.check_content(result.full_text)
+                if dup:
                     logger.info("  Duplicate content, skipping")
                     continue
 
-                self._dedup.mark_seen(info.url, result.full_text)
+                self._dedup.mark_content(content_key)
                 stats["extracted"] += 1
 
                 title = f"{ticker} {info.quarter} {info.year} Earnings Call Transcript"
@@ -359,29 +428,44 @@ class TranscriptPipeline:
                     else result.full_text
                 )
                 source_file = f"{ticker}_transcript_{info.quarter}_{info.year}.parquet"
-                records.append({
-                    "company": ticker,
-                    "title": title,
-                    "link": info.url,
-                    "snippet": snippet,
-                    "date": result.date or info.pub_date,
-                    "source": "fool.com",
-                    "full_text": result.full_text,
-                    "source_file": source_file,
-                })
-
-                # Interval-based checkpoint save
-                self._checkpoint.save_if_due(_CHECKPOINT_INTERVAL)
-
-        return records
+                # Looked up per record: a save replaces the buffer
+                columns = self._pending
+                columns["company"].append(ticker)
+                columns["title"].append(title)
+                columns["link"].append(info.url)
+                columns["snippet"].append(snippet)
+                columns["date"].append(result.date or info.pub_date)
+                columns["source"].append("fool.com")
+                columns["full_text"].append(result.full_text)
+                columns["source_file"].append(source_file)
+                n_records += 1
+                if len(columns["link"]) >= _PARQUET_BATCH:
+                    self._checkpoint.save()
+
+        return n_records
+
+    def _flush_output(self):
+        """Checkpoint pre-save hook: buffered records, then the parquet shard."""
+        self._flush_pending()
+        self._parquet.flush()
+
+    def _flush_pending(self):
+        """Write buffered records to the output files as one batch."""
+        if not self._pending["link"]:
+            return
+        self._parquet.append_columns(self._pending)
+        if self._jsonl:
+            self._jsonl.append_columns(self._pending)
+        self._pending = {name: [] for name in SCHEMA.names}
 
     def _handle_sigint(self, sig, frame):
         """Handle Ctrl+C gracefully. Second Ctrl+C force-quits."""
         if self._shutdown_requested:
             raise KeyboardInterrupt  # second Ctrl+C = force quit
         logger.warning("Shutdown requested — finishing current ticker and saving checkpoint...")
+        # The ticker loop stops on this flag and runs the final flush + save;
+        # saving here could flush _pending while a record is half-appended.
         self._shutdown_requested = True
-        self._checkpoint.save()
 
     def _load_tickers(self) -> list[str]:
         """Load ticker list from config (inline or file)."""
@@ -392,17 +476,11 @@ class TranscriptPipeline:
             if not path.exists():
                 logger.error(f"Tickers file not found: {path}")
                 return tickers
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip().upper()
-                    if line and not line.startswith("#"):
-                        tickers.append(line)
+            lines = (
+                line.strip().upper()
+                for line in path.read_text(encoding="utf-8").splitlines()
+            )
+            tickers.extend(line for line in lines if line and not line.startswith("#"))
 
         # Deduplicate while preserving order
-        seen: set[str] = set()
-        unique = []
-        for t in tickers:
-            if t not in seen:
-                seen.add(t)
-                unique.append(t)
-        return unique
+        return list(dict.fromkeys(tickers))
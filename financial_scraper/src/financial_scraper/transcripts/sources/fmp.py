@@ -4,14 +4,29 @@ Free tier: 250 requests/day, historical data back to 2013.
 Get a free API key at: https://financialmodelingprep.com/register
 
 Usage:
-    source = FMPSource(api_key="your_key")          # or set FMP_API_KEY env var
-    result = source.get_transcript("AAPL", "Q1", 2024, session)
+    with FMPSource(api_key="your_key") as source:   # or set FMP_API_KEY env var
+        result = source.get_transcript("AAPL", "Q1", 2024)
 """
 
 import logging
 import os
+import threading
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Use orjson when available for faster payload decoding, fallback to stdlib json
+try:
+    import orjson
+
+    def _json_loads(raw: bytes | str):
+        return orjson.loads(raw)
+
+except ImportError:
+    import json as _json
+
+    def _json_loads(raw: bytes | str):  # type: ignore[misc]
+        return _json.loads(raw)
 
 from ..extract import TranscriptResult
 
@@ -19,17 +34,46 @@ logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://financialmodelingprep.com/stable/earning-call-transcript"
 
+# Connections kept to the FMP host; sized above the pipeline's worker count
+_POOL_MAXSIZE = 20
+
 
 class FMPSource:
-    """Fetches earnings call transcripts from the FMP API."""
+    """Fetches earnings call transcripts from the FMP API.
+
+    Calls without an explicit session share one lazily created
+    ``requests.Session``, so repeat requests reuse pooled TLS connections.
+    Call ``close()`` (or use as a context manager) when done.
+    """
 
     def __init__(self, api_key: str = ""):
         self.api_key = api_key or os.environ.get("FMP_API_KEY", "")
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
 
     @property
     def available(self) -> bool:
         return bool(self.api_key)
 
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                sess = requests.Session()
+                sess.mount("https://", HTTPAdapter(pool_maxsize=_POOL_MAXSIZE))
+                self._session = sess
+            return self._session
+
     def get_transcript(
         self,
         ticker: str,
@@ -43,7 +87,8 @@ class FMPSource:
             ticker:  Ticker symbol, e.g. "AAPL"
             quarter: Quarter string, e.g. "Q1" / "Q2" / "Q3" / "Q4"
             year:    Fiscal year, e.g. 2024
-            session: Optional requests.Session to reuse (shares connection pool).
+            session: Optional requests.Session to use instead of the
+                     source's own shared session.
 
         Returns:
             TranscriptResult if found and non-empty, else None.
@@ -53,7 +98,7 @@ class FMPSource:
             return None
 
         q_num = int(quarter[1])  # "Q3" -> 3
-        sess = session or requests.Session()
+        sess = session or self._get_session()
 
         try:
             resp = sess.get(
@@ -83,8 +128,8 @@ class FMPSource:
             return None
 
         try:
-            data = resp.json()
-        except ValueError:
+            data = _json_loads(resp.content)
+        except ValueError:  # both decoders raise ValueError subclasses
             logger.warning(f"FMP returned non-JSON for {ticker} {quarter} {year}")
             return None
 
@@ -17,6 +17,12 @@ def sample_config() -> ScraperConfig:
     )
 
 
+@pytest.fixture(scope="session")
+def default_scraper_config() -> ScraperConfig:
+    """Default ScraperConfig, built once; frozen so safe to share."""
+    return ScraperConfig()
+
+
 @pytest.fixture
 def tmp_parquet(tmp_path):
     return tmp_path / "test_output.parquet"
@@ -1,5 +1,8 @@
 """Tests for financial_scraper.checkpoint."""
 
+import asyncio
+import threading
+
 from financial_scraper.checkpoint import Checkpoint
 
 
@@ -58,6 +61,22 @@ class TestPersistence:
         assert cp2.is_url_fetched("https://example.com/1") is True
         assert cp2.failed_urls["https://example.com/bad"] == 1
 
+    def test_flush_hooks_run_before_write(self, tmp_path):
+        path = tmp_path / "cp.json"
+        cp = Checkpoint(path)
+        seen = []
+        cp.flush_before_save(lambda: seen.append(path.exists()))
+        cp.save()
+        asyncio.run(cp.asave())
+        assert seen == [False, True]
+
+    def test_asave_runs_flush_hooks_off_the_loop(self, tmp_path):
+        cp = Checkpoint(tmp_path / "cp.json")
+        threads = []
+        cp.flush_before_save(lambda: threads.append(threading.current_thread()))
+        asyncio.run(cp.asave())
+        assert threads and threads[0] is not threading.main_thread()
+
     def test_load_missing_file_is_noop(self, tmp_path):
         cp = Checkpoint(tmp_path / "nonexistent.json")
         cp.load()  # should not raise
@@ -125,3 +144,34 @@ class TestStats:
         cp.mark_url_failed("https://example.com/1")
         cp.mark_url_failed("https://example.com/2")
         assert cp.stats["failed_fetches"] == 2
+
+
+class TestAsyncSave:
+    def test_amark_query_done_persists(self, tmp_path):
+        path = tmp_path / "cp.json"
+        cp = Checkpoint(path)
+        cp.mark_url_fetched("https://example.com/1")
+        asyncio.run(cp.amark_query_done("q1"))
+        assert cp.stats["total_queries"] == 1
+
+        cp2 = Checkpoint(path)
+        cp2.load()
+        assert cp2.is_query_done("q1") is True
+        assert cp2.is_url_fetched("https://example.com/1") is True
+
+    def test_asave_snapshot_taken_before_write(self, tmp_path):
+        path = tmp_path / "cp.json"
+        cp = Checkpoint(path)
+        cp.mark_url_fetched("https://example.com/1")
+
+        async def _save_then_mutate():
+            task = asyncio.create_task(cp.asave())
+            await asyncio.sleep(0)
+            cp.mark_url_fetched("https://example.com/2")
+            await task
+
+        asyncio.run(_save_then_mutate())
+        cp2 = Checkpoint(path)
+        cp2.load()
+        assert cp2.is_url_fetched("https://example.com/1") is True
+        assert cp2.is_url_fetched("https://example.com/2") is False
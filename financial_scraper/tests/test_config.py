@@ -8,25 +8,20 @@ from financial_scraper.config import ScraperConfig, apply_stealth
 
 
 class TestScraperConfigDefaults:
-    def test_default_max_results(self):
-        cfg = ScraperConfig()
-        assert cfg.max_results_per_query == 20
+    def test_default_max_results(self, default_scraper_config):
+        assert default_scraper_config.max_results_per_query == 20
 
-    def test_default_search_type(self):
-        cfg = ScraperConfig()
-        assert cfg.search_type == "text"
+    def test_default_search_type(self, default_scraper_config):
+        assert default_scraper_config.search_type == "text"
 
-    def test_default_stealth_off(self):
-        cfg = ScraperConfig()
-        assert cfg.stealth is False
+    def test_default_stealth_off(self, default_scraper_config):
+        assert default_scraper_config.stealth is False
 
-    def test_default_respect_robots(self):
-        cfg = ScraperConfig()
-        assert cfg.respect_robots is True
+    def test_default_respect_robots(self, default_scraper_config):
+        assert default_scraper_config.respect_robots is True
 
-    def test_default_min_word_count(self):
-        cfg = ScraperConfig()
-        assert cfg.min_word_count == 100
+    def test_default_min_word_count(self, default_scraper_config):
+        assert default_scraper_config.min_word_count == 100
 
 
 class TestApplyStealth:
@@ -2,18 +2,32 @@
 
 import argparse
 import asyncio
+import itertools
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import MappingProxyType
+from unittest.mock import AsyncMock, MagicMock
 
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import pytest
 
 pytest.importorskip("crawl4ai", reason="crawl4ai not installed")
 
+from financial_scraper.crawl import pipeline as crawl_pipeline
 from financial_scraper.crawl.config import CrawlConfig, apply_stealth
 from financial_scraper.crawl.pipeline import CrawlPipeline
+from financial_scraper.extract import pdf as pdf_mod
+from financial_scraper.extract.html import ExtractionResult
+from financial_scraper.extract.pdf import (
+    PDFExtractor,
+    _extract_content_date,
+    _extract_metadata_date,
+    extract_pdf_date,
+    get_pdf_extractor,
+)
 from financial_scraper.main import build_crawl_config, _resolve_output_paths
 from financial_scraper.store.output import make_source_file_tag
 
@@ -22,53 +36,71 @@ from financial_scraper.store.output import make_source_file_tag
 # Helpers
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FakeCrawlResult:
     """Minimal stand-in for crawl4ai CrawlResult."""
     url: str
     html: str
     success: bool = True
     status_code: int = 200
-    metadata: dict = None
-    response_headers: dict = None
+    metadata: dict = field(default_factory=dict)
+    response_headers: dict = field(default_factory=dict)
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-        if self.response_headers is None:
-            self.response_headers = {}
 
+_ARTICLE_COUNTER = itertools.count(1)
 
-_ARTICLE_COUNTER = 0
-
-
-def _make_article_html(extra: str = "") -> str:
-    """Generate unique article HTML to avoid trafilatura dedup cache."""
-    global _ARTICLE_COUNTER
-    _ARTICLE_COUNTER += 1
-    return f"""
-<html><head><title>Q4 Earnings Report {_ARTICLE_COUNTER}</title></head><body>
+_ARTICLE_TEMPLATE = """
+<html><head><title>Q4 Earnings Report %(n)d</title></head><body>
 <article>
-<h1>Q4 Earnings Report {_ARTICLE_COUNTER}</h1>
+<h1>Q4 Earnings Report %(n)d</h1>
 <p>The company reported strong quarterly results with revenue growth
-across all segments in period {_ARTICLE_COUNTER}. Operating income improved significantly compared
+across all segments in period %(n)d. Operating income improved significantly compared
 to the prior year period. Management highlighted continued investment
 in technology and product development as key drivers of future growth.
 The board approved a new share repurchase program reflecting confidence
 in the business outlook. Analysts noted the company exceeded consensus
-estimates for both revenue and earnings per share this quarter. {extra}</p>
+estimates for both revenue and earnings per share this quarter. %(extra)s</p>
 </article></body></html>
 """
 
 
+def _make_article_html(extra: str = "") -> str:
+    """Generate unique article HTML to avoid trafilatura dedup cache."""
+    return _ARTICLE_TEMPLATE % {"n": next(_ARTICLE_COUNTER), "extra": extra}
+
+
+@pytest.fixture
+def mock_crawler(monkeypatch):
+    """Patch out crawl4ai and the strategy builders; return the crawler instance.
+
+    Tests set ``mock_crawler.arun.return_value`` / ``side_effect``.
+    """
+    instance = AsyncMock()
+    instance.__aenter__.return_value = instance
+    instance.__aexit__.return_value = False
+    monkeypatch.setattr(crawl_pipeline, "AsyncWebCrawler", MagicMock(return_value=instance))
+    for name in ("build_browser_config", "build_crawl_strategy", "build_crawler_config"):
+        monkeypatch.setattr(crawl_pipeline, name, MagicMock())
+    return instance
+
+
+@pytest.fixture(scope="session")
+def example_urls_file(tmp_path_factory):
+    """Read-only seed file listing https://example.com, written once."""
+    path = tmp_path_factory.mktemp("seeds") / "urls.txt"
+    path.write_text("https://example.com\n")
+    return path
+
+
 def _make_crawl_config(tmp_path, **overrides) -> CrawlConfig:
     """Build a test CrawlConfig pointing to tmp_path."""
-    urls_file = tmp_path / "urls.txt"
-    if not urls_file.exists():
-        urls_file.write_text("https://example.com\n")
+    if "urls_file" not in overrides:
+        urls_file = tmp_path / "urls.txt"
+        if not urls_file.exists():
+            urls_file.write_text("https://example.com\n")
+        overrides["urls_file"] = urls_file
 
     defaults = dict(
-        urls_file=urls_file,
         min_word_count=10,
         output_dir=tmp_path,
         output_path=tmp_path / "crawl_test.parquet",
@@ -82,9 +114,14 @@ def _make_crawl_config(tmp_path, **overrides) -> CrawlConfig:
 # CrawlConfig
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def default_crawl_config():
+    return CrawlConfig()
+
+
 class TestCrawlConfig:
-    def test_defaults(self):
-        cfg = CrawlConfig()
+    def test_defaults(self, default_crawl_config):
+        cfg = default_crawl_config
         assert cfg.max_depth == 2
         assert cfg.max_pages == 50
         assert cfg.semaphore_count == 2
@@ -92,10 +129,9 @@ class TestCrawlConfig:
         assert cfg.check_robots_txt is True
         assert cfg.stealth is False
 
-    def test_frozen(self):
-        cfg = CrawlConfig()
+    def test_frozen(self, default_crawl_config):
         with pytest.raises(AttributeError):
-            cfg.max_depth = 5
+            default_crawl_config.max_depth = 5
 
     def test_apply_stealth(self):
         cfg = CrawlConfig(stealth=True, semaphore_count=4)
@@ -187,40 +223,42 @@ class TestCrawlExclusions:
 # ---------------------------------------------------------------------------
 
 class TestExtractDomain:
-    def test_simple(self):
-        assert CrawlPipeline._extract_domain("https://reuters.com/page") == "reuters.com"
-
-    def test_strips_www(self):
-        assert CrawlPipeline._extract_domain("https://www.reuters.com/page") == "reuters.com"
-
-    def test_preserves_subdomain(self):
-        assert CrawlPipeline._extract_domain("https://finance.yahoo.com/q") == "finance.yahoo.com"
+    @pytest.mark.parametrize("url,expected", [
+        ("https://reuters.com/page", "reuters.com"),
+        ("https://www.reuters.com/page", "reuters.com"),
+        ("https://finance.yahoo.com/q", "finance.yahoo.com"),
+    ], ids=["simple", "strips_www", "preserves_subdomain"])
+    def test_extract_domain(self, url, expected):
+        assert CrawlPipeline._extract_domain(url) == expected
 
 
 # ---------------------------------------------------------------------------
 # Checkpoint resume
 # ---------------------------------------------------------------------------
 
+# Checkpoint with done.com already completed, serialized once.
+_RESUME_CHECKPOINT = json.dumps({
+    "completed_queries": ["https://done.com"],
+    "fetched_urls": [],
+    "failed_urls": {},
+    "stats": {
+        "total_queries": 1, "total_pages": 0,
+        "total_words": 0, "failed_fetches": 0,
+        "failed_extractions": 0,
+    },
+})
+
+
 class TestCrawlCheckpoint:
-    @pytest.mark.asyncio
-    async def test_resume_skips_done(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_resume_skips_done(self, tmp_path, mock_crawler):
         """Seed URLs already in checkpoint are skipped."""
         urls_file = tmp_path / "urls.txt"
         urls_file.write_text("https://done.com\nhttps://new.com\n")
 
         # Pre-populate checkpoint
         cp_file = tmp_path / ".crawl_checkpoint.json"
-        cp_data = {
-            "completed_queries": ["https://done.com"],
-            "fetched_urls": [],
-            "failed_urls": {},
-            "stats": {
-                "total_queries": 1, "total_pages": 0,
-                "total_words": 0, "failed_fetches": 0,
-                "failed_extractions": 0,
-            },
-        }
-        cp_file.write_text(json.dumps(cp_data))
+        cp_file.write_text(_RESUME_CHECKPOINT)
 
         cfg = _make_crawl_config(
             tmp_path, urls_file=urls_file,
@@ -232,23 +270,14 @@ class TestCrawlCheckpoint:
             html=_make_article_html(),
         )
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = [fake_result]
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        mock_crawler.arun.return_value = [fake_result]
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
-            # Only "new.com" should be crawled
-            assert instance.arun.call_count == 1
-            call_url = instance.arun.call_args[1].get("url") or instance.arun.call_args[0][0]
-            assert "new.com" in call_url
+        # Only "new.com" should be crawled
+        assert mock_crawler.arun.call_count == 1
+        call_url = mock_crawler.arun.call_args[1].get("url") or mock_crawler.arun.call_args[0][0]
+        assert "new.com" in call_url
 
 
 # ---------------------------------------------------------------------------
@@ -256,16 +285,13 @@ class TestCrawlCheckpoint:
 # ---------------------------------------------------------------------------
 
 class TestCrawlPipeline:
-    @pytest.mark.asyncio
-    async def test_basic_crawl_extracts_and_stores(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_basic_crawl_extracts_and_stores(self, tmp_path, example_urls_file, mock_crawler):
         """Mock crawl4ai, verify extraction and parquet output."""
-        urls_file = tmp_path / "urls.txt"
-        urls_file.write_text("https://example.com\n")
-
         parquet_path = tmp_path / "crawl_out.parquet"
         cfg = _make_crawl_config(
             tmp_path,
-            urls_file=urls_file,
+            urls_file=example_urls_file,
             output_path=parquet_path,
         )
 
@@ -274,40 +300,28 @@ class TestCrawlPipeline:
             FakeCrawlResult(url="https://example.com/page2", html=_make_article_html()),
         ]
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = fake_results
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        mock_crawler.arun.return_value = fake_results
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
         # Verify parquet was written
         assert parquet_path.exists()
-        table = pq.read_table(parquet_path)
-        assert len(table) >= 1
+        table = pq.read_table(
+            parquet_path, columns=["company", "source_file"], memory_map=True,
+        )
+        assert table.num_rows >= 1
         # Company should be the seed domain
-        companies = table.column("company").to_pylist()
-        assert all(c == "example.com" for c in companies)
+        assert pc.all(pc.equal(table["company"], "example.com")).as_py()
         # source_file should contain "crawl"
-        source_files = table.column("source_file").to_pylist()
-        assert all("crawl" in sf for sf in source_files)
+        assert pc.all(pc.match_substring(table["source_file"], "crawl")).as_py()
 
-    @pytest.mark.asyncio
-    async def test_failed_crawl_results_skipped(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_failed_crawl_results_skipped(self, tmp_path, example_urls_file, mock_crawler):
         """Pages with success=False are skipped."""
-        urls_file = tmp_path / "urls.txt"
-        urls_file.write_text("https://example.com\n")
-
         parquet_path = tmp_path / "crawl_out.parquet"
         cfg = _make_crawl_config(
             tmp_path,
-            urls_file=urls_file,
+            urls_file=example_urls_file,
             output_path=parquet_path,
         )
 
@@ -315,24 +329,15 @@ class TestCrawlPipeline:
             FakeCrawlResult(url="https://example.com", html="", success=False),
         ]
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = fake_results
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        mock_crawler.arun.return_value = fake_results
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
         # No parquet should be created (no successful extractions)
         assert not parquet_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_single_result_not_list(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_single_result_not_list(self, tmp_path, mock_crawler):
         """arun returning a single CrawlResult (not wrapped in list) works."""
         urls_file = tmp_path / "urls.txt"
         urls_file.write_text("https://single-test.com\n")
@@ -347,23 +352,14 @@ class TestCrawlPipeline:
         # Return a single result, not a list
         fake_result = FakeCrawlResult(url="https://single-test.com", html=_make_article_html())
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = fake_result  # not a list
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        mock_crawler.arun.return_value = fake_result  # not a list
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
         assert parquet_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_crawl_exception_handled(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_crawl_exception_handled(self, tmp_path, mock_crawler):
         """If arun raises, the seed is marked done and we continue."""
         urls_file = tmp_path / "urls.txt"
         urls_file.write_text("https://bad.com\nhttps://good.com\n")
@@ -377,36 +373,20 @@ class TestCrawlPipeline:
 
         good_result = FakeCrawlResult(url="https://good.com", html=_make_article_html())
 
-        call_count = 0
-
-        async def side_effect(**kwargs):
-            nonlocal call_count
-            call_count += 1
-            url = kwargs.get("url", "")
-            if "bad.com" in url:
-                raise RuntimeError("Connection failed")
-            return [good_result]
-
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.side_effect = side_effect
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        # Seeds are crawled in file order: bad.com raises, good.com returns.
+        mock_crawler.arun.side_effect = [RuntimeError("Connection failed"), [good_result]]
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
         # Both seeds were attempted
-        assert call_count == 2
+        assert [c.kwargs["url"] for c in mock_crawler.arun.call_args_list] == [
+            "https://bad.com", "https://good.com",
+        ]
         # good.com should have produced output
         assert parquet_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_jsonl_output(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_jsonl_output(self, tmp_path, mock_crawler):
         """JSONL writer is used when configured."""
         urls_file = tmp_path / "urls.txt"
         urls_file.write_text("https://jsonl-test.com\n")
@@ -422,23 +402,15 @@ class TestCrawlPipeline:
 
         fake_result = FakeCrawlResult(url="https://jsonl-test.com", html=_make_article_html())
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = [fake_result]
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"):
-                with patch("financial_scraper.crawl.pipeline.build_crawl_strategy"):
-                    with patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                        pipeline = CrawlPipeline(cfg)
-                        await pipeline.run()
+        mock_crawler.arun.return_value = [fake_result]
+        pipeline = CrawlPipeline(cfg)
+        await pipeline.run()
 
         assert jsonl_path.exists()
-        lines = jsonl_path.read_text().strip().split("\n")
-        assert len(lines) >= 1
-        data = json.loads(lines[0])
+        with open(jsonl_path, encoding="utf-8") as f:
+            first = f.readline()
+        assert first
+        data = json.loads(first)
         assert data["company"] == "jsonl-test.com"
 
 
@@ -446,62 +418,62 @@ class TestCrawlPipeline:
 # build_crawl_config (CLI args -> CrawlConfig)
 # ---------------------------------------------------------------------------
 
+_CRAWL_ARG_DEFAULTS = MappingProxyType({
+    "urls_file": "urls.txt",
+    "output_dir": None,
+    "max_depth": 2,
+    "max_pages": 50,
+    "semaphore_count": 2,
+    "min_words": 100,
+    "target_language": None,
+    "no_favor_precision": False,
+    "date_from": None,
+    "date_to": None,
+    "jsonl": False,
+    "markdown": False,
+    "exclude_file": None,
+    "checkpoint": ".crawl_checkpoint.json",
+    "resume": False,
+    "no_robots": False,
+    "stealth": False,
+    "pdf_extractor": "auto",
+    "save_raw": False,
+    "pdf_dir": None,
+    "html_dir": None,
+})
+
+
 def _make_crawl_args(**overrides):
-    defaults = {
-        "urls_file": "urls.txt",
-        "output_dir": None,
-        "max_depth": 2,
-        "max_pages": 50,
-        "semaphore_count": 2,
-        "min_words": 100,
-        "target_language": None,
-        "no_favor_precision": False,
-        "date_from": None,
-        "date_to": None,
-        "jsonl": False,
-        "markdown": False,
-        "exclude_file": None,
-        "checkpoint": ".crawl_checkpoint.json",
-        "resume": False,
-        "no_robots": False,
-        "stealth": False,
-        "pdf_extractor": "auto",
-        "save_raw": False,
-        "pdf_dir": None,
-        "html_dir": None,
-    }
-    defaults.update(overrides)
-    return argparse.Namespace(**defaults)
+    return argparse.Namespace(**{**_CRAWL_ARG_DEFAULTS, **overrides})
+
+
+@pytest.fixture(scope="session")
+def cli_output_dir(tmp_path_factory):
+    """Output dir for CLI-config tests, which only resolve paths under it."""
+    return tmp_path_factory.mktemp("cli_out")
 
 
 class TestBuildCrawlConfig:
-    def test_basic(self, tmp_path):
-        args = _make_crawl_args(output_dir=str(tmp_path))
+    def test_basic(self, cli_output_dir):
+        args = _make_crawl_args(output_dir=str(cli_output_dir))
         cfg = build_crawl_config(args)
         assert cfg.max_depth == 2
         assert cfg.max_pages == 50
         assert cfg.urls_file == Path("urls.txt")
 
-    def test_custom_depth_and_pages(self, tmp_path):
-        args = _make_crawl_args(
-            output_dir=str(tmp_path), max_depth=3, max_pages=100,
-        )
+    @pytest.mark.parametrize("overrides,attr,expected", [
+        ({"max_depth": 3}, "max_depth", 3),
+        ({"max_pages": 100}, "max_pages", 100),
+        ({"stealth": True}, "stealth", True),
+        ({"no_robots": True}, "check_robots_txt", False),
+    ], ids=["depth", "pages", "stealth", "no_robots"])
+    def test_flag_maps_to_config(self, cli_output_dir, overrides, attr, expected):
+        args = _make_crawl_args(output_dir=str(cli_output_dir), **overrides)
         cfg = build_crawl_config(args)
-        assert cfg.max_depth == 3
-        assert cfg.max_pages == 100
+        assert getattr(cfg, attr) == expected
 
-    def test_stealth(self, tmp_path):
-        args = _make_crawl_args(output_dir=str(tmp_path), stealth=True)
-        cfg = build_crawl_config(args)
-        assert cfg.stealth is True
-
-    def test_no_robots(self, tmp_path):
-        args = _make_crawl_args(output_dir=str(tmp_path), no_robots=True)
-        cfg = build_crawl_config(args)
-        assert cfg.check_robots_txt is False
-
-    def test_output_paths_prefixed_crawl(self, tmp_path):
-        args = _make_crawl_args(output_dir=str(tmp_path))
+    def test_output_paths_prefixed_crawl(self, cli_output_dir):
+        args = _make_crawl_args(output_dir=str(cli_output_dir))
         cfg = build_crawl_config(args)
         assert "crawl_" in cfg.output_path.name
 
@@ -511,8 +483,8 @@ class TestBuildCrawlConfig:
 # ---------------------------------------------------------------------------
 
 class TestResolveOutputPathsCrawl:
-    def test_crawl_prefix(self, tmp_path):
-        args = _make_crawl_args(output_dir=str(tmp_path))
+    def test_crawl_prefix(self, cli_output_dir):
+        args = _make_crawl_args(output_dir=str(cli_output_dir))
         _, out_path, _, _ = _resolve_output_paths(args, prefix="crawl")
         assert "crawl_" in out_path.name
         assert out_path.suffix == ".parquet"
@@ -523,22 +495,18 @@ class TestResolveOutputPathsCrawl:
 # ---------------------------------------------------------------------------
 
 class TestPdfDetection:
-    def test_pdf_url_detected(self):
-        assert CrawlPipeline._is_pdf("https://example.com/report.pdf", {}) is True
-
-    def test_pdf_url_case_insensitive(self):
-        assert CrawlPipeline._is_pdf("https://example.com/report.PDF", {}) is True
-
-    def test_content_type_detected(self):
-        headers = {"content-type": "application/pdf; charset=utf-8"}
-        assert CrawlPipeline._is_pdf("https://example.com/doc", headers) is True
-
-    def test_non_pdf_not_detected(self):
-        assert CrawlPipeline._is_pdf("https://example.com/page.html", {}) is False
-
-    def test_non_pdf_content_type(self):
-        headers = {"content-type": "text/html"}
-        assert CrawlPipeline._is_pdf("https://example.com/page", headers) is False
+    @pytest.mark.parametrize("url,headers,expected", [
+        ("https://example.com/report.pdf", {}, True),
+        ("https://example.com/report.PDF", {}, True),
+        ("https://example.com/doc", {"content-type": "application/pdf; charset=utf-8"}, True),
+        ("https://example.com/page.html", {}, False),
+        ("https://example.com/page", {"content-type": "text/html"}, False),
+    ], ids=[
+        "pdf_url", "pdf_url_case_insensitive", "pdf_content_type",
+        "non_pdf_url", "non_pdf_content_type",
+    ])
+    def test_is_pdf(self, url, headers, expected):
+        assert CrawlPipeline._is_pdf(url, headers) is expected
 
 
 # ---------------------------------------------------------------------------
@@ -546,15 +514,12 @@ class TestPdfDetection:
 # ---------------------------------------------------------------------------
 
 class TestPdfDownloadAndExtract:
-    @pytest.mark.asyncio
-    async def test_pdf_routed_through_pdf_extractor(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_pdf_routed_through_pdf_extractor(self, tmp_path, example_urls_file, mock_crawler):
         """PDF URLs should be downloaded and extracted via PDF extractor."""
-        urls_file = tmp_path / "urls.txt"
-        urls_file.write_text("https://example.com\n")
-
         parquet_path = tmp_path / "crawl_out.parquet"
         cfg = _make_crawl_config(
-            tmp_path, urls_file=urls_file, output_path=parquet_path,
+            tmp_path, urls_file=example_urls_file, output_path=parquet_path,
         )
 
         fake_result = FakeCrawlResult(
@@ -564,47 +529,40 @@ class TestPdfDownloadAndExtract:
         )
 
         fake_pdf_bytes = b"%PDF-1.4 fake content"
-        mock_extraction = MagicMock()
-        mock_extraction.extraction_method = "pdfplumber"
-        mock_extraction.word_count = 200
-        mock_extraction.text = "Extracted PDF content " * 20
-        mock_extraction.title = "Report"
-        mock_extraction.date = None
-
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = [fake_result]
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"), \
-                 patch("financial_scraper.crawl.pipeline.build_crawl_strategy"), \
-                 patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                pipeline = CrawlPipeline(cfg)
-
-                # Mock the PDF extractor and download
-                pipeline._pdf_extractor = MagicMock()
-                pipeline._pdf_extractor.extract.return_value = mock_extraction
-                pipeline._download_pdf_bytes = AsyncMock(return_value=fake_pdf_bytes)
-
-                await pipeline.run()
+        extraction = ExtractionResult(
+            text="Extracted PDF content " * 20,
+            title="Report",
+            author=None,
+            date=None,
+            word_count=200,
+            extraction_method="pdfplumber",
+            language=None,
+        )
+
+        mock_crawler.arun.return_value = [fake_result]
+        pipeline = CrawlPipeline(cfg)
+
+        # Mock the PDF extractor and download
+        pipeline._pdf_extractor = MagicMock()
+        pipeline._pdf_extractor.extract.return_value = extraction
+        pipeline._download_pdf_bytes = AsyncMock(return_value=fake_pdf_bytes)
+
+        await pipeline.run()
 
         pipeline._download_pdf_bytes.assert_called_once_with("https://example.com/report.pdf")
         pipeline._pdf_extractor.extract.assert_called_once_with(fake_pdf_bytes, "https://example.com/report.pdf")
         assert parquet_path.exists()
+        table = pq.read_table(parquet_path, columns=["title"], memory_map=True)
+        assert table["title"].to_pylist() == ["Report"]
 
 
 class TestPdfDownloadFailure:
-    @pytest.mark.asyncio
-    async def test_pdf_download_failure_graceful(self, tmp_path):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_pdf_download_failure_graceful(self, tmp_path, example_urls_file, mock_crawler):
         """Failed PDF download should not crash the pipeline."""
-        urls_file = tmp_path / "urls.txt"
-        urls_file.write_text("https://example.com\n")
-
         parquet_path = tmp_path / "crawl_out.parquet"
         cfg = _make_crawl_config(
-            tmp_path, urls_file=urls_file, output_path=parquet_path,
+            tmp_path, urls_file=example_urls_file, output_path=parquet_path,
         )
 
         fake_result = FakeCrawlResult(
@@ -613,20 +571,11 @@ class TestPdfDownloadFailure:
             response_headers={},
         )
 
-        with patch("financial_scraper.crawl.pipeline.AsyncWebCrawler") as MockCrawler:
-            instance = AsyncMock()
-            instance.arun.return_value = [fake_result]
-            instance.__aenter__ = AsyncMock(return_value=instance)
-            instance.__aexit__ = AsyncMock(return_value=False)
-            MockCrawler.return_value = instance
-
-            with patch("financial_scraper.crawl.pipeline.build_browser_config"), \
-                 patch("financial_scraper.crawl.pipeline.build_crawl_strategy"), \
-                 patch("financial_scraper.crawl.pipeline.build_crawler_config"):
-                pipeline = CrawlPipeline(cfg)
-                pipeline._download_pdf_bytes = AsyncMock(return_value=None)
+        mock_crawler.arun.return_value = [fake_result]
+        pipeline = CrawlPipeline(cfg)
+        pipeline._download_pdf_bytes = AsyncMock(return_value=None)
 
-                await pipeline.run()
+        await pipeline.run()
 
         # No output — PDF download failed
         assert not parquet_path.exists()
@@ -638,36 +587,22 @@ class TestPdfDownloadFailure:
 
 class TestGetPdfExtractor:
     def test_pdfplumber_always_works(self):
-        from financial_scraper.extract.pdf import get_pdf_extractor, PDFExtractor
         ext = get_pdf_extractor("pdfplumber")
         assert isinstance(ext, PDFExtractor)
 
     def test_auto_returns_extractor(self):
-        from financial_scraper.extract.pdf import get_pdf_extractor, PDFExtractor
         ext = get_pdf_extractor("auto")
         # Should return either PDFExtractor or DoclingExtractor depending on env
         assert hasattr(ext, "extract")
 
-    def test_auto_falls_back_without_docling(self):
-        from financial_scraper.extract.pdf import PDFExtractor
-        import financial_scraper.extract.pdf as pdf_mod
-        original = pdf_mod.DOCLING_AVAILABLE
-        try:
-            pdf_mod.DOCLING_AVAILABLE = False
-            ext = pdf_mod.get_pdf_extractor("auto")
-            assert isinstance(ext, PDFExtractor)
-        finally:
-            pdf_mod.DOCLING_AVAILABLE = original
-
-    def test_docling_raises_when_unavailable(self):
-        import financial_scraper.extract.pdf as pdf_mod
-        original = pdf_mod.DOCLING_AVAILABLE
-        try:
-            pdf_mod.DOCLING_AVAILABLE = False
-            with pytest.raises(ImportError):
-                pdf_mod.get_pdf_extractor("docling")
-        finally:
-            pdf_mod.DOCLING_AVAILABLE = original
+    def test_auto_falls_back_without_docling(self, monkeypatch):
+        monkeypatch.setattr(pdf_mod, "DOCLING_AVAILABLE", False)
+        assert isinstance(get_pdf_extractor("auto"), PDFExtractor)
+
+    def test_docling_raises_when_unavailable(self, monkeypatch):
+        monkeypatch.setattr(pdf_mod, "DOCLING_AVAILABLE", False)
+        with pytest.raises(ImportError):
+            get_pdf_extractor("docling")
 
 
 # ---------------------------------------------------------------------------
@@ -675,41 +610,24 @@ class TestGetPdfExtractor:
 # ---------------------------------------------------------------------------
 
 class TestExtractContentDate:
-    def test_day_month_year(self):
-        from financial_scraper.extract.pdf import _extract_content_date
-        text = "Report for the period ending 31 December 2024 stuff"
+    # Month-only dates get no day component checked: the day is filled in
+    # from today by the parser's defaults.
+    @pytest.mark.parametrize("text,expected", [
+        ("Report for the period ending 31 December 2024 stuff", (2024, 12, 31)),
+        ("Published October 2025 by The Asia Group", (2025, 10)),
+        ("Date: 2026-01-27 some content", (2026, 1, 27)),
+        ("Filed on 15/06/2025 with ASIC", (2025, 6, 15)),
+    ], ids=["day_month_year", "month_year_only", "iso_date", "slash_date"])
+    def test_parses_date(self, text, expected):
         dt = _extract_content_date(text)
         assert dt is not None
-        assert dt.year == 2024 and dt.month == 12 and dt.day == 31
-
-    def test_month_year_only(self):
-        from financial_scraper.extract.pdf import _extract_content_date
-        text = "Published October 2025 by The Asia Group"
-        dt = _extract_content_date(text)
-        assert dt is not None
-        assert dt.year == 2025 and dt.month == 10
-
-    def test_iso_date(self):
-        from financial_scraper.extract.pdf import _extract_content_date
-        text = "Date: 2026-01-27 some content"
-        dt = _extract_content_date(text)
-        assert dt is not None
-        assert dt.year == 2026 and dt.month == 1 and dt.day == 27
-
-    def test_slash_date(self):
-        from financial_scraper.extract.pdf import _extract_content_date
-        text = "Filed on 15/06/2025 with ASIC"
-        dt = _extract_content_date(text)
-        assert dt is not None
-        assert dt.year == 2025 and dt.month == 6 and dt.day == 15
+        assert (dt.year, dt.month, dt.day)[:len(expected)] == expected
 
     def test_no_date_returns_none(self):
-        from financial_scraper.extract.pdf import _extract_content_date
         text = "No dates in this text at all just words"
         assert _extract_content_date(text) is None
 
     def test_respects_max_chars(self):
-        from financial_scraper.extract.pdf import _extract_content_date
         # Date is beyond the 500-char window
         text = "x" * 501 + "27 January 2026"
         assert _extract_content_date(text, max_chars=500) is None
@@ -718,7 +636,6 @@ class TestExtractContentDate:
 
 class TestExtractMetadataDate:
     def test_reads_creation_date(self):
-        from financial_scraper.extract.pdf import _extract_metadata_date
         # Minimal valid PDF with a CreationDate in the Info dict
         pdf_bytes = (
             b"%PDF-1.0\n"
@@ -740,48 +657,41 @@ class TestExtractMetadataDate:
         assert dt.year == 2025 and dt.month == 2 and dt.day == 24
 
     def test_invalid_pdf_returns_none(self):
-        from financial_scraper.extract.pdf import _extract_metadata_date
         assert _extract_metadata_date(b"not a pdf") is None
 
 
+@pytest.fixture
+def pdf_date_sources(monkeypatch):
+    """Patch the content/metadata date helpers; return (content, meta) mocks."""
+    content, meta = MagicMock(), MagicMock()
+    monkeypatch.setattr(pdf_mod, "_extract_content_date", content)
+    monkeypatch.setattr(pdf_mod, "_extract_metadata_date", meta)
+    return content, meta
+
+
 class TestExtractPdfDate:
-    def test_takes_latest_date(self):
-        from financial_scraper.extract.pdf import extract_pdf_date
+    def test_takes_latest_date(self, pdf_date_sources):
         # Mock: content has Dec 2024, metadata has Feb 2025
         # Should return Feb 2025 (the latest)
-        with patch("financial_scraper.extract.pdf._extract_content_date") as mock_content, \
-             patch("financial_scraper.extract.pdf._extract_metadata_date") as mock_meta:
-            from datetime import datetime
-            mock_content.return_value = datetime(2024, 12, 31)
-            mock_meta.return_value = datetime(2025, 2, 24)
-            result = extract_pdf_date(b"fake", "some text")
-            assert result == "2025-02-24"
-
-    def test_content_only(self):
-        from financial_scraper.extract.pdf import extract_pdf_date
-        with patch("financial_scraper.extract.pdf._extract_content_date") as mock_content, \
-             patch("financial_scraper.extract.pdf._extract_metadata_date") as mock_meta:
-            from datetime import datetime
-            mock_content.return_value = datetime(2025, 10, 21)
-            mock_meta.return_value = None
-            result = extract_pdf_date(b"fake", "some text")
-            assert result == "2025-10-21"
-
-    def test_metadata_only(self):
-        from financial_scraper.extract.pdf import extract_pdf_date
-        with patch("financial_scraper.extract.pdf._extract_content_date") as mock_content, \
-             patch("financial_scraper.extract.pdf._extract_metadata_date") as mock_meta:
-            from datetime import datetime
-            mock_content.return_value = None
-            mock_meta.return_value = datetime(2025, 7, 29)
-            result = extract_pdf_date(b"fake", "some text")
-            assert result == "2025-07-29"
-
-    def test_no_dates_returns_none(self):
-        from financial_scraper.extract.pdf import extract_pdf_date
-        with patch("financial_scraper.extract.pdf._extract_content_date") as mock_content, \
-             patch("financial_scraper.extract.pdf._extract_metadata_date") as mock_meta:
-            mock_content.return_value = None
-            mock_meta.return_value = None
-            result = extract_pdf_date(b"fake", "some text")
-            assert result is None
+        mock_content, mock_meta = pdf_date_sources
+        mock_content.return_value = datetime(2024, 12, 31)
+        mock_meta.return_value = datetime(2025, 2, 24)
+        assert extract_pdf_date(b"fake", "some text") == "2025-02-24"
+
+    def test_content_only(self, pdf_date_sources):
+        mock_content, mock_meta = pdf_date_sources
+        mock_content.return_value = datetime(2025, 10, 21)
+        mock_meta.return_value = None
+        assert extract_pdf_date(b"fake", "some text") == "2025-10-21"
+
+    def test_metadata_only(self, pdf_date_sources):
+        mock_content, mock_meta = pdf_date_sources
+        mock_content.return_value = None
+        mock_meta.return_value = datetime(2025, 7, 29)
+        assert extract_pdf_date(b"fake", "some text") == "2025-07-29"
+
+    def test_no_dates_returns_none(self, pdf_date_sources):
+        mock_content, mock_meta = pdf_date_sources
+        mock_content.return_value = None
+        mock_meta.return_value = None
+        assert extract_pdf_date(b"fake", "some text") is None
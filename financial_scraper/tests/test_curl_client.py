@@ -0,0 +1,37 @@
+"""Tests for financial_scraper.fetch.curl_client."""
+
+from unittest.mock import MagicMock, patch
+
+from financial_scraper.fetch.curl_client import CurlSession
+
+
+def _session_with_mock_builder():
+    s = CurlSession(proxy="http://p1:8080")
+    built = []
+
+    def build():
+        m = MagicMock()
+        built.append(m)
+        return m
+
+    return s, built, patch.object(s, "_build_session", side_effect=build)
+
+
+class TestSetProxy:
+    def test_same_proxy_keeps_session(self):
+        s, built, patcher = _session_with_mock_builder()
+        with patcher:
+            s.get("https://example.com")
+            s.set_proxy("http://p1:8080")
+            s.get("https://example.com")
+        assert len(built) == 1
+        built[0].close.assert_not_called()
+
+    def test_new_proxy_recreates_session(self):
+        s, built, patcher = _session_with_mock_builder()
+        with patcher:
+            s.get("https://example.com")
+            s.set_proxy("http://p2:8080")
+            s.get("https://example.com")
+        assert len(built) == 2
+        built[0].close.assert_called_once()
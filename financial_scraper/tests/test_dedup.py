@@ -28,6 +28,13 @@ class TestURLDedup:
         d.mark_seen("https://EXAMPLE.COM/Page", "content")
         assert d.is_duplicate_url("https://example.com/page") is True
 
+    def test_check_then_mark_url(self):
+        d = Deduplicator()
+        dup, key = d.check_url("https://example.com/page")
+        assert dup is False
+        d.mark_url(key)
+        assert d.check_url("https://example.com/page#top") == (True, key)
+
     def test_trailing_slash_stripped(self):
         d = Deduplicator()
         d.mark_seen("https://example.com/page/", "content")
@@ -67,6 +74,35 @@ class TestPersistence:
         assert d2.is_duplicate_url("https://example.com/2") is True
         assert d2.is_duplicate_content("content one") is True
 
+    def test_load_foreign_hash_ignores_keys(self, tmp_path):
+        import json
+
+        path = tmp_path / "dedup.json"
+        path.write_text(json.dumps({"urls": ["ab" * 32], "content": ["cd" * 32]}))
+        d = Deduplicator()
+        d.load(path)  # legacy SHA-256 file should not raise
+        assert d.is_duplicate_url("https://example.com/1") is False
+
+    def test_load_legacy_json_state(self, tmp_path):
+        import json
+        from financial_scraper.store.dedup import _HASH_NAME
+
+        d = Deduplicator()
+        h = d._hash_url("https://example.com/1")
+        path = tmp_path / "dedup.json"
+        path.write_text(json.dumps({"hash": _HASH_NAME, "urls": [f"{h:x}"], "content": []}))
+        d2 = Deduplicator()
+        d2.load(path)
+        assert d2.is_duplicate_url("https://example.com/1") is True
+
+    def test_load_rejects_pickled_globals(self, tmp_path):
+        import pickle
+
+        path = tmp_path / "dedup.bin"
+        path.write_bytes(pickle.dumps({"urls": {1}, "obj": Deduplicator}, protocol=5))
+        with pytest.raises(pickle.UnpicklingError):
+            Deduplicator().load(path)
+
     def test_load_missing_file_is_noop(self, tmp_path):
         path = tmp_path / "nonexistent.json"
         d = Deduplicator()
@@ -149,6 +185,27 @@ class TestFuzzyDedup:
         rewrite = self._make_near_duplicate(self.BASE_ARTICLE)
         assert d2.is_duplicate_content(rewrite) is True
 
+    def test_empty_index_skips_minhash(self, monkeypatch):
+        d = Deduplicator()
+        calls = []
+        monkeypatch.setattr(d, "_minhash_content", lambda c: calls.append(c))
+        assert d.is_duplicate_content(self.BASE_ARTICLE) is False
+        assert calls == []
+
+    def test_check_content_minhash_reused_by_mark(self, monkeypatch):
+        d = Deduplicator()
+        d.mark_seen("https://a.com/article", self.BASE_ARTICLE)
+        other = self.BASE_ARTICLE.replace("Apple", "Microsoft").upper()
+        dup, key = d.check_content(other)
+        assert dup is False
+        assert key.minhash is not None
+
+        calls = []
+        monkeypatch.setattr(d, "_minhash_content", lambda c: calls.append(c))
+        d.mark_content(key)
+        assert calls == []
+        assert d.is_duplicate_content(other) is True
+
     def test_short_and_empty_content_no_crash(self):
         d = Deduplicator()
         # Empty content
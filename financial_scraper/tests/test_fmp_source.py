@@ -1,5 +1,7 @@
 """Tests for the FMP fallback transcript source."""
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -50,7 +52,7 @@ _SAMPLE_RESPONSE = [
 def _mock_resp(status=200, json_data=None, text=""):
     m = MagicMock()
     m.status_code = status
-    m.json.return_value = json_data if json_data is not None else []
+    m.content = json.dumps(json_data if json_data is not None else []).encode()
     m.text = text
     return m
 
@@ -106,6 +108,17 @@ class TestFMPGetTranscript:
         assert result is not None
         assert result.full_text
 
+    def test_shared_session_reused_across_calls(self):
+        src = self._src()
+        with patch("financial_scraper.transcripts.sources.fmp.requests.Session") as mock_cls:
+            mock_cls.return_value.get.return_value = _mock_resp(200, _SAMPLE_RESPONSE)
+            src.get_transcript("AAPL", "Q1", 2024)
+            src.get_transcript("AAPL", "Q2", 2024)
+            src.close()
+        mock_cls.assert_called_once()
+        assert mock_cls.return_value.get.call_count == 2
+        mock_cls.return_value.close.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # FMPSource.get_transcript — error cases
@@ -156,8 +169,7 @@ class TestFMPErrors:
 
     def test_returns_none_on_invalid_json(self):
         mock_sess = MagicMock()
-        resp = MagicMock(status_code=200)
-        resp.json.side_effect = ValueError("bad json")
+        resp = MagicMock(status_code=200, content=b"<html>not json</html>")
         mock_sess.get.return_value = resp
         assert self._src().get_transcript("AAPL", "Q1", 2024, mock_sess) is None
 
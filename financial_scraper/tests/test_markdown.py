@@ -6,6 +6,7 @@ from financial_scraper.store.markdown import (
     MarkdownWriter,
     format_record_md,
     format_records_md,
+    iter_records_md,
     _slugify,
 )
 
@@ -71,6 +72,10 @@ class TestFormatRecordMd:
         md = format_record_md(_make_record(title=""))
         assert "# Untitled" in md
 
+    def test_null_full_text(self):
+        md = format_record_md(_make_record(full_text=None))
+        assert "| **Words** | 0 |" in md
+
 
 class TestFormatRecordsMd:
     def test_header(self):
@@ -100,6 +105,14 @@ class TestFormatRecordsMd:
         md = format_records_md([_make_record()])
         assert "Full article about oil markets" in md
 
+    def test_null_full_text(self):
+        md = format_records_md([_make_record(full_text=None), _make_record()])
+        assert "2 articles" in md
+
+    def test_iter_lines_match_formatted(self):
+        records = [_make_record(), _make_record(company="gold price")]
+        assert "\n".join(iter_records_md(records)) == format_records_md(records)
+
 
 class TestMarkdownWriter:
     def test_creates_combined_file(self, tmp_path):
@@ -163,3 +176,26 @@ class TestMarkdownWriter:
 
         md_dir = tmp_path / "markdown"
         assert len(list(md_dir.glob("*.md"))) == 2
+
+    def test_parallel_writes_keep_numbering(self, tmp_path):
+        md_path = tmp_path / "report.md"
+        w = MarkdownWriter(md_path)
+        w.append([_make_record(title=f"Article {i}") for i in range(1, 21)])
+
+        md_dir = tmp_path / "markdown"
+        for i in range(1, 21):
+            content = (md_dir / f"oil_futures_{i:03d}.md").read_text(encoding="utf-8")
+            assert content.startswith(f"# Article {i}\n")
+
+    def test_word_count_computed_once_per_record(self, tmp_path, monkeypatch):
+        from financial_scraper.store import markdown
+
+        calls = []
+        real = markdown._word_count
+        monkeypatch.setattr(markdown, "_word_count", lambda t: calls.append(t) or real(t))
+        w = MarkdownWriter(tmp_path / "report.md")
+        w.append([_make_record(title="A"), _make_record(title="B")])
+
+        assert len(calls) == 2
+        individual = (tmp_path / "markdown" / "oil_futures_001.md").read_text(encoding="utf-8")
+        assert f"| **Words** | {real(_make_record()['full_text'])} |" in individual
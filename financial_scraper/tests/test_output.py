@@ -4,8 +4,10 @@ import json
 from unittest.mock import patch
 
 import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 
+from financial_scraper.checkpoint import Checkpoint
 from financial_scraper.store.output import (
     SCHEMA,
     JSONLWriter,
@@ -35,6 +37,13 @@ class TestParseDate:
     def test_none_input(self):
         assert _parse_date(None) is None
 
+    def test_iso_with_offset(self):
+        result = _parse_date("2024-06-15T14:30:00+00:00")
+        assert result == pd.Timestamp("2024-06-15 14:30:00", tz="UTC")
+
+    def test_invalid_year_month(self):
+        assert _parse_date("2024-13") is None
+
     def test_unparseable(self):
         assert _parse_date("not-a-date") is None
 
@@ -88,27 +97,161 @@ def _make_record(**overrides):
 
 class TestParquetWriter:
     def test_creates_new_file(self, tmp_parquet):
-        w = ParquetWriter(tmp_parquet)
-        w.append([_make_record()])
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record()])
         assert tmp_parquet.exists()
         table = pq.read_table(tmp_parquet)
         assert len(table) == 1
 
     def test_appends_to_existing(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="First")])
+            w.append([_make_record(title="Second")])
+        table = pq.read_table(tmp_parquet)
+        assert len(table) == 2
+
+    def test_appends_across_writers(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="First")])
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="Second")])
+        table = pq.read_table(tmp_parquet)
+        assert table.column("title").to_pylist() == ["First", "Second"]
+
+    def test_one_row_group_per_append(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="First")])
+            w.append([_make_record(title="Second")])
+        assert pq.ParquetFile(tmp_parquet).num_row_groups == 2
+
+    def test_mixed_date_formats_and_missing_fields(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([
+                {"title": "a", "date": "2024-06-15"},
+                {"title": "b", "date": "2024-06-15T14:30:00"},
+                {"title": "c", "date": "not-a-date"},
+            ])
+        table = pq.read_table(tmp_parquet)
+        assert table.column("date").to_pylist()[:2] == [
+            pd.Timestamp("2024-06-15"), pd.Timestamp("2024-06-15 14:30:00"),
+        ]
+        assert table.column("date").to_pylist()[2] is None
+        assert table.column("link").to_pylist() == ["", "", ""]
+
+    def test_dates_outside_vectorized_formats(self, tmp_parquet):
+        from datetime import datetime
+
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([
+                {"title": "a", "date": "2024-06-15T14:30:00.500000"},
+                {"title": "b", "date": datetime(2024, 1, 2, 3, 4, 5)},
+                {"title": "c", "date": "2024"},
+                {"title": "d", "date": ""},
+            ])
+        table = pq.read_table(tmp_parquet)
+        assert table.column("date").to_pylist() == [
+            pd.Timestamp("2024-06-15 14:30:00.5"), pd.Timestamp("2024-01-02 03:04:05"),
+            pd.Timestamp("2024-01-01"), None,
+        ]
+
+    def test_append_columns(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append_columns({
+                "title": ["a", "b"],
+                "link": ["https://a.com", "https://b.com"],
+                "date": ["2024-06-15", None],
+            })
+            w.append([_make_record(title="c")])
+        table = pq.read_table(tmp_parquet)
+        assert table.column("title").to_pylist() == ["a", "b", "c"]
+        assert table.column("company").to_pylist()[:2] == ["", ""]
+        assert table.column("date").to_pylist()[:2] == [pd.Timestamp("2024-06-15"), None]
+
+    def test_flushed_rows_survive_kill(self, tmp_parquet, tmp_path):
+        # Simulate a kill after a checkpoint save: the writer is never closed.
+        cp = Checkpoint(tmp_path / "cp.json")
         w = ParquetWriter(tmp_parquet)
+        cp.flush_before_save(w.flush)
         w.append([_make_record(title="First")])
+        cp.mark_query_done("q1")
+        w.append([_make_record(title="Unsaved")])
+
+        with ParquetWriter(tmp_parquet) as w2:
+            w2.append([_make_record(title="Second")])
+        table = pq.read_table(tmp_parquet)
+        assert table.column("title").to_pylist() == ["First", "Second"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["cp.json", tmp_parquet.name]
+
+    def test_flush_does_not_reread_output(self, tmp_parquet):
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="old")])
+        w = ParquetWriter(tmp_parquet)
+        with patch.object(
+            ParquetWriter, "_open_with_retry", wraps=ParquetWriter._open_with_retry,
+        ) as opened:
+            for i in range(20):
+                w.append([_make_record(title=f"t{i}")])
+                w.flush()
+            assert opened.call_count == 0
+            w.close()
+            assert [c.args[0] for c in opened.call_args_list].count(tmp_parquet) == 1
+        table = pq.read_table(tmp_parquet)
+        assert table.column("title").to_pylist() == ["old"] + [f"t{i}" for i in range(20)]
+        assert pq.ParquetFile(tmp_parquet).num_row_groups == 21
+
+    def test_merged_shards_not_merged_twice(self, tmp_parquet, tmp_path):
+        # A kill between publishing the merge and deleting its shards.
+        w = ParquetWriter(tmp_parquet)
+        w.append([_make_record(title="First")])
+        w.flush()
+        (shard,) = w._shards
+        saved = shard.read_bytes()
+        w.close()
+        shard.write_bytes(saved)
+
+        with ParquetWriter(tmp_parquet) as w2:
+            w2.append([_make_record(title="Second")])
+        assert pq.read_table(tmp_parquet).column("title").to_pylist() == ["First", "Second"]
+        assert not shard.exists()
+
+    def test_flush_during_write_is_deferred(self, tmp_parquet):
+        # A SIGINT handler saving the checkpoint while a batch is being written.
+        w = ParquetWriter(tmp_parquet)
+        w.append([_make_record(title="First")])
+        real = w._writer
+
+        class Interrupted:
+            def write_table(self, table):
+                w.flush()
+                real.write_table(table)
+
+            def close(self):
+                real.close()
+
+        w._writer = Interrupted()
         w.append([_make_record(title="Second")])
+        assert w._writer is None and len(w._shards) == 1
+        w.close()
+        assert pq.read_table(tmp_parquet).column("title").to_pylist() == ["First", "Second"]
+
+    def test_existing_file_missing_columns(self, tmp_parquet):
+        old = pa.table({"title": ["old"], "link": ["https://old.com"]})
+        pq.write_table(old, tmp_parquet)
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record(title="new")])
         table = pq.read_table(tmp_parquet)
-        assert len(table) == 2
+        assert table.column_names == SCHEMA.names
+        assert table.column("title").to_pylist() == ["old", "new"]
+        assert table.column("snippet").to_pylist() == [None, "A test snippet."]
 
     def test_empty_list_is_noop(self, tmp_parquet):
-        w = ParquetWriter(tmp_parquet)
-        w.append([])
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([])
         assert not tmp_parquet.exists()
 
     def test_schema_columns(self, tmp_parquet):
-        w = ParquetWriter(tmp_parquet)
-        w.append([_make_record()])
+        with ParquetWriter(tmp_parquet) as w:
+            w.append([_make_record()])
         table = pq.read_table(tmp_parquet)
         expected_cols = [f.name for f in SCHEMA]
         assert table.column_names == expected_cols
@@ -135,3 +278,12 @@ class TestJSONLWriter:
         w = JSONLWriter(tmp_jsonl)
         w.append([])
         assert not tmp_jsonl.exists()
+
+    def test_append_columns(self, tmp_jsonl):
+        w = JSONLWriter(tmp_jsonl)
+        w.append_columns({"company": ["A", "B"], "title": ["t1", "t2"]})
+        lines = tmp_jsonl.read_text().strip().split("\n")
+        assert [json.loads(line) for line in lines] == [
+            {"company": "A", "title": "t1"},
+            {"company": "B", "title": "t2"},
+        ]
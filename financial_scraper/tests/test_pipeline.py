@@ -1,6 +1,7 @@
 """Tests for financial_scraper.pipeline."""
 
 import asyncio
+import threading
 from collections import Counter
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -103,6 +104,23 @@ class TestExtractDomain:
     def test_with_port(self):
         assert ScraperPipeline._extract_domain("https://example.com:8080/p") == "example.com:8080"
 
+    def test_query_without_path(self):
+        assert ScraperPipeline._extract_domain("https://Example.com?q=1") == "example.com"
+
+    def test_no_scheme(self):
+        assert ScraperPipeline._extract_domain("example.com/page") == ""
+
+    def test_scheme_relative(self):
+        assert ScraperPipeline._extract_domain("//CDN.example.com/a.pdf") == "cdn.example.com"
+
+    @pytest.mark.parametrize("url", [
+        "https://example.com", "//example.com", "HTTP://User@Host:80/x#f",
+        "mailto:someone@example.com", "/relative/path", "", "https://[::1]:8080/",
+    ])
+    def test_matches_urlparse(self, url):
+        from urllib.parse import urlparse
+        assert ScraperPipeline._extract_domain(url) == urlparse(url).netloc.lower()
+
 
 class TestPrintSummary:
     def test_runs_without_error(self, tmp_path):
@@ -286,6 +304,60 @@ class TestRunWithResults:
 
         assert p._checkpoint.is_query_done("test query")
 
+    def test_searches_each_pending_query_once_in_order(self, tmp_path):
+        qf = tmp_path / "queries.txt"
+        qf.write_text("q1\nq2\nq1\nq3\n")
+        p = _make_pipeline(tmp_path)
+
+        mock_searcher = MagicMock()
+        mock_searcher.search.return_value = []
+
+        with patch("financial_scraper.pipeline.DDGSearcher", return_value=mock_searcher):
+            asyncio.run(p.run())
+
+        searched = [c.args[0] for c in mock_searcher.search.call_args_list]
+        assert searched == ["q1", "q2", "q3"]
+        assert all(p._checkpoint.is_query_done(q) for q in ("q1", "q2", "q3"))
+
+    def test_prefetched_search_cancelled_when_loop_raises(self, tmp_path):
+        qf = tmp_path / "queries.txt"
+        qf.write_text("q1\nq2\n")
+        p = _make_pipeline(tmp_path)
+
+        release = threading.Event()
+
+        def search(query, max_results):
+            if query == "q2":
+                release.wait(5)
+            return []
+
+        mock_searcher = MagicMock()
+        mock_searcher.search.side_effect = search
+        started: list[asyncio.Task] = []
+        start_search = p._start_search
+
+        def record(query):
+            task = start_search(query)
+            started.append(task)
+            return task
+
+        async def run_and_check():
+            p._start_search = record
+            p._checkpoint.amark_query_done = AsyncMock(side_effect=RuntimeError("disk full"))
+            with pytest.raises(RuntimeError):
+                await p.run()
+            return [t.done() for t in started]
+
+        with patch("financial_scraper.pipeline.DDGSearcher", return_value=mock_searcher):
+            try:
+                done = asyncio.run(run_and_check())
+            finally:
+                release.set()
+
+        assert done == [True, True]
+        assert started[1].cancelled()
+        mock_searcher.cancel.assert_called_once()
+
     def test_pipeline_failed_extraction(self, tmp_path):
         from financial_scraper.search.duckduckgo import SearchResult
         from financial_scraper.fetch.client import FetchResult
@@ -67,6 +67,21 @@ class TestDDGSearcherSearch:
 
         assert results == []
 
+    @patch("financial_scraper.search.duckduckgo.time")
+    @patch("financial_scraper.search.duckduckgo.random")
+    def test_search_news_leaves_config_untouched(self, mock_random, mock_time):
+        mock_random.uniform.return_value = 0.0
+        mock_time.time.return_value = 1000.0
+        mock_time.sleep = MagicMock()
+
+        searcher = self._make_searcher(search_type="text")
+
+        with patch.object(searcher, "_do_search_with_retry", return_value=[]) as mock_retry:
+            searcher.search_news("test query", 5)
+
+        mock_retry.assert_called_once_with("test query", 5, search_type="news")
+        assert searcher._config.search_type == "text"
+
 
 class TestDoSearchWithRetry:
     def _make_searcher(self, **config_overrides):
@@ -83,7 +98,7 @@ class TestDoSearchWithRetry:
         from duckduckgo_search.exceptions import RatelimitException
 
         call_count = 0
-        def side_effect(query, max_results):
+        def side_effect(query, max_results, search_type=None):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -116,7 +131,7 @@ class TestDoSearchWithRetry:
 
         searcher = self._make_searcher()
         call_count = 0
-        def side_effect(query, max_results):
+        def side_effect(query, max_results, search_type=None):
             nonlocal call_count
             call_count += 1
             if call_count < 3:
@@ -129,6 +144,33 @@ class TestDoSearchWithRetry:
         assert len(result) == 1
 
 
+    @patch("financial_scraper.search.duckduckgo.time")
+    def test_cancel_stops_retries(self, mock_time):
+        mock_time.sleep = MagicMock()
+        mock_time.time.return_value = 1000.0
+
+        searcher = self._make_searcher()
+        from duckduckgo_search.exceptions import RatelimitException
+
+        def side_effect(query, max_results, search_type=None):
+            searcher.cancel()
+            raise RatelimitException("rate limited")
+
+        with patch.object(searcher, "_do_search_inner", side_effect=side_effect) as inner:
+            result = searcher._do_search_with_retry("test", 5)
+
+        assert result == []
+        assert inner.call_count == 1
+        mock_time.sleep.assert_not_called()
+
+    def test_cancelled_search_skips_request(self):
+        searcher = self._make_searcher()
+        searcher.cancel()
+        with patch.object(searcher, "_do_search_with_retry") as retry:
+            assert searcher.search("test", 5) == []
+        retry.assert_not_called()
+
+
 class TestDoSearchInner:
     def _make_searcher(self, **config_overrides):
         defaults = {"search_delay_min": 0.0, "search_delay_max": 0.0}
@@ -161,6 +203,19 @@ class TestDoSearchInner:
         assert len(result) == 1
         mock_ddgs.news.assert_called_once()
 
+    def test_search_type_override(self):
+        searcher = self._make_searcher(search_type="text")
+        mock_ddgs = MagicMock()
+        mock_ddgs.__enter__ = MagicMock(return_value=mock_ddgs)
+        mock_ddgs.__exit__ = MagicMock(return_value=False)
+        mock_ddgs.news.return_value = []
+
+        with patch.object(searcher, "_get_ddgs_class", return_value=lambda **kw: mock_ddgs):
+            searcher._do_search_inner("query", 5, search_type="news")
+
+        mock_ddgs.news.assert_called_once()
+        mock_ddgs.text.assert_not_called()
+
 
 class TestSearchWithTor:
     @patch("financial_scraper.search.duckduckgo.time")
@@ -218,7 +273,7 @@ class TestSearchWithTor:
         assert searcher._consecutive_ratelimits == 0
 
         # Actual ratelimit increments counter
-        def fake_retry_ratelimit(query, max_results):
+        def fake_retry_ratelimit(query, max_results, search_type=None):
             searcher._hit_ratelimit = True
             return []
         with patch.object(searcher, "_do_search_with_retry", side_effect=fake_retry_ratelimit):
@@ -226,7 +281,7 @@ class TestSearchWithTor:
         assert searcher._consecutive_ratelimits == 1
 
         # Successful result resets counter to 0
-        def fake_retry_success(query, max_results):
+        def fake_retry_success(query, max_results, search_type=None):
             searcher._hit_ratelimit = False
             return [{"href": "https://a.com", "title": "T", "body": "B"}]
         with patch.object(searcher, "_do_search_with_retry", side_effect=fake_retry_success):
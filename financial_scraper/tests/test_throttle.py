@@ -1,10 +1,11 @@
 """Tests for financial_scraper.fetch.throttle."""
 
 import asyncio
+from unittest.mock import patch
 
 import pytest
 
-from financial_scraper.fetch.throttle import DomainThrottler
+from financial_scraper.fetch.throttle import DomainThrottler, SyncDomainThrottler
 
 
 class TestReportSuccess:
@@ -117,3 +118,14 @@ class TestMaxDelayCap:
         assert t._extra_delays["example.com"] == 5.0
         t.report_failure("example.com", 429)
         assert t._extra_delays["example.com"] == 5.0
+
+
+class TestSyncAcquireSpacing:
+    def test_waiting_callers_get_consecutive_slots(self):
+        """Callers that arrive together are spaced one delay apart, not woken at once."""
+        t = SyncDomainThrottler(base_delay=1.0, max_per_domain=3)
+        with patch("financial_scraper.fetch.throttle.time.monotonic", return_value=100.0):
+            with patch("financial_scraper.fetch.throttle.time.sleep") as mock_sleep:
+                for _ in range(3):
+                    t.acquire("example.com")
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
@@ -1,6 +1,8 @@
 """Tests for financial_scraper.transcripts module."""
 
 import json
+import time
+
 import pytest
 
 from financial_scraper.transcripts.config import TranscriptConfig
@@ -9,6 +11,7 @@ from financial_scraper.transcripts.discovery import (
     _normalize_ticker,
     _ticker_to_slug,
     _fetch_sitemap_urls,
+    clear_sitemap_cache,
     discover_transcripts,
     TranscriptInfo,
 )
@@ -22,6 +25,14 @@ from financial_scraper.transcripts.extract import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_sitemap_cache():
+    """Sitemap results are cached per process; isolate each test."""
+    clear_sitemap_cache()
+    yield
+    clear_sitemap_cache()
+
+
 # ---------------------------------------------------------------------------
 # Discovery tests
 # ---------------------------------------------------------------------------
@@ -241,6 +252,32 @@ class TestExtractTranscriptOldFormat:
         result = extract_transcript(html)
         assert result is None
 
+    def test_no_article_body_bytes_returns_none(self):
+        html = b"<html><body><p>No transcript here.</p></body></html>"
+        assert extract_transcript(html, encoding="utf-8") is None
+
+    def test_article_body_among_other_classes(self):
+        html = (
+            '<html><body><div class="tailwind article-body-extra"></div>'
+            '<div class="tailwind article-body">'
+            "<p>Operator: Good day and welcome to the call.</p></div></body></html>"
+        )
+        result = extract_transcript(html)
+        assert result is not None
+        assert "welcome to the call" in result.full_text
+
+    def test_other_h2_sections_excluded(self):
+        html = (
+            '<html><body><div class="article-body">'
+            "<h2>Contents:</h2><p>Prepared Remarks, Questions and Answers</p>"
+            "<h2>Full Conference Call Transcript</h2>"
+            "<p>Operator: Good day and welcome to the call.</p>"
+            "<h2>Related Articles</h2><p>More stock coverage worth reading.</p>"
+            "</div></body></html>"
+        )
+        result = extract_transcript(html)
+        assert result.full_text == "Operator: Good day and welcome to the call."
+
 
 class TestExtractTranscriptLiveFormat:
     """Tests for the live Motley Fool HTML format (Prepared Remarks, Q&A, <p> participants)."""
@@ -288,6 +325,40 @@ class TestExtractTranscriptLiveFormat:
         assert result.quarter == "Q1"
         assert result.year == 2025
 
+    def test_raw_bytes_match_decoded_text(self):
+        html = MOCK_TRANSCRIPT_LIVE.replace("Kevan Parekh", "Kévan Parekh")
+        expected = extract_transcript(html)
+        result = extract_transcript(html.encode("utf-8"), encoding="utf-8")
+        assert result == expected
+        assert "Kévan Parekh" in result.speakers
+
+    def test_raw_bytes_without_encoding_use_meta_charset(self):
+        html = MOCK_TRANSCRIPT_LIVE.replace("Kevan Parekh", "Kévan Parekh")
+        html = html.replace("<head>", '<head><meta charset="utf-8">', 1)
+        result = extract_transcript(html.encode("utf-8"), encoding=None)
+        assert "Kévan Parekh" in result.speakers
+
+
+class TestPageCharset:
+    def test_declared_charset(self):
+        from financial_scraper.transcripts.pipeline import _page_charset
+
+        headers = {"content-type": 'text/html; charset="ISO-8859-1"'}
+        assert _page_charset(headers) == "ISO-8859-1"
+
+    def test_undeclared_defaults_to_utf8(self):
+        from financial_scraper.transcripts.pipeline import _page_charset
+
+        assert _page_charset({"content-type": "text/html"}) == "utf-8"
+        assert _page_charset({}) == "utf-8"
+
+    def test_undeclared_utf8_page_without_meta(self):
+        from financial_scraper.transcripts.pipeline import _page_charset
+
+        html = MOCK_TRANSCRIPT_LIVE.replace("Kevan Parekh", "Kévan Parekh — CFO")
+        result = extract_transcript(html.encode("utf-8"), encoding=_page_charset({}))
+        assert "Kévan Parekh — CFO" in result.full_text
+
 
 class TestExtractSpeakersFromText:
     """Text-based speaker extraction (fallback for older format)."""
@@ -486,6 +557,7 @@ class TestTranscriptPipelineRun:
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.text = "<html><body>transcript</body></html>"
+        mock_resp.headers = {}
 
         cfg = _make_transcript_config(tmp_path)
         p = TranscriptPipeline(cfg)
@@ -497,6 +569,35 @@ class TestTranscriptPipelineRun:
 
         assert (tmp_path / "out.parquet").exists()
 
+    def test_run_reuses_extract_cache(self, tmp_path):
+        from financial_scraper.transcripts.pipeline import TranscriptPipeline
+        from unittest.mock import patch, MagicMock
+        import pyarrow.parquet as pq
+
+        result = TranscriptResult(
+            company="Apple", ticker="AAPL", quarter="Q1", year=2025,
+            date="2025-01-30", full_text=_SAMPLE_FULL_TEXT, speakers=["Tim Cook"],
+        )
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
+
+        cfg = _make_transcript_config(tmp_path, extract_cache_dir=tmp_path / "cache")
+        p = TranscriptPipeline(cfg)
+        with patch("financial_scraper.transcripts.pipeline.discover_transcripts", return_value=[_SAMPLE_INFO]):
+            with patch.object(p._session, "get", return_value=mock_resp):
+                with patch("financial_scraper.transcripts.pipeline.extract_transcript", return_value=result):
+                    p.run()
+
+        # Fresh run (no resume): served from the cache without any request
+        (tmp_path / "out.parquet").unlink()
+        p = TranscriptPipeline(cfg)
+        with patch("financial_scraper.transcripts.pipeline.discover_transcripts", return_value=[_SAMPLE_INFO]):
+            with patch.object(p._session, "get") as mock_get:
+                p.run()
+
+        mock_get.assert_not_called()
+        table = pq.read_table(tmp_path / "out.parquet")
+        assert table.column("full_text").to_pylist() == [_SAMPLE_FULL_TEXT]
+
     def test_run_fetch_failure(self, tmp_path):
         from financial_scraper.transcripts.pipeline import TranscriptPipeline
         from unittest.mock import patch
@@ -542,6 +643,7 @@ class TestTranscriptPipelineRun:
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.text = "<html><body>transcript</body></html>"
+        mock_resp.headers = {}
 
         jsonl_path = tmp_path / "out.jsonl"
         cfg = _make_transcript_config(tmp_path, jsonl_path=jsonl_path)
@@ -592,7 +694,7 @@ class TestTranscriptPipelineConcurrent:
 
         infos = self._make_infos(3)
         extract_results = self._make_results(3)
-        mock_resp = MagicMock(status_code=200, text="<html></html>")
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
 
         cfg = _make_transcript_config(tmp_path, concurrent=3)
         p = TranscriptPipeline(cfg)
@@ -619,8 +721,8 @@ class TestTranscriptPipelineConcurrent:
         # First GET returns 404, the other two return 200
         responses = [
             MagicMock(status_code=404),
-            MagicMock(status_code=200, text="<html></html>"),
-            MagicMock(status_code=200, text="<html></html>"),
+            MagicMock(status_code=200, text="<html></html>", headers={}),
+            MagicMock(status_code=200, text="<html></html>", headers={}),
         ]
 
         cfg = _make_transcript_config(tmp_path, concurrent=3)
@@ -644,7 +746,7 @@ class TestTranscriptPipelineConcurrent:
 
         infos = self._make_infos(2)
         extract_results = self._make_results(2)
-        mock_resp = MagicMock(status_code=200, text="<html></html>")
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
 
         cfg = _make_transcript_config(tmp_path, concurrent=1)
         p = TranscriptPipeline(cfg)
@@ -682,6 +784,29 @@ class TestFetchSitemapUrls:
         assert len(urls) == 2
         assert any("aapl-q1-2025" in u for u in urls)
 
+    def test_parse_drops_entries_already_read(self, monkeypatch):
+        from lxml import etree
+        from financial_scraper.transcripts.discovery import _parse_sitemap_xml
+
+        sitemap_xml = "<urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>" + "".join(
+            f"<url><loc>https://www.fool.com/a{i}/</loc><lastmod>2025-01-30</lastmod></url>"
+            for i in range(5000)
+        ) + "</urlset>"
+        sizes = []
+        real_iterparse = etree.iterparse
+
+        def iterparse(*args, **kwargs):
+            for event, elem in real_iterparse(*args, **kwargs):
+                yield event, elem
+                sizes.append(len(elem.getroottree().getroot()))
+
+        monkeypatch.setattr(etree, "iterparse", iterparse)
+        urls = _parse_sitemap_xml(sitemap_xml)
+
+        assert urls == [f"https://www.fool.com/a{i}/" for i in range(5000)]
+        # Only lxml's read-ahead buffer is ever attached, never the whole urlset
+        assert max(sizes) < 1000
+
     def test_returns_empty_on_non_200(self):
         from unittest.mock import patch, MagicMock
         mock_resp = MagicMock()
@@ -702,6 +827,60 @@ class TestFetchSitemapUrls:
 
         assert urls == []
 
+    def test_success_is_cached(self):
+        from unittest.mock import patch, MagicMock
+        mock_resp = MagicMock(status_code=200, text="<urlset><url><loc>https://a</loc></url></urlset>")
+
+        with patch("financial_scraper.transcripts.discovery.requests.get",
+                   return_value=mock_resp) as mock_get:
+            assert _fetch_sitemap_urls(2025, 1) == ["https://a"]
+            assert _fetch_sitemap_urls(2025, 1) == ["https://a"]
+
+        assert mock_get.call_count == 1
+
+    def test_current_month_entry_expires(self):
+        from datetime import datetime
+        from unittest.mock import patch, MagicMock
+        from financial_scraper.transcripts import discovery
+        mock_resp = MagicMock(status_code=200, text="<urlset><url><loc>https://a</loc></url></urlset>")
+        now = datetime.now()
+        t0 = time.monotonic()
+
+        with patch("financial_scraper.transcripts.discovery.requests.get",
+                   return_value=mock_resp) as mock_get:
+            with patch.object(discovery.time, "monotonic", return_value=t0):
+                _fetch_sitemap_urls(now.year, now.month)
+                _fetch_sitemap_urls(now.year, now.month)
+            assert mock_get.call_count == 1
+            with patch.object(discovery.time, "monotonic",
+                              return_value=t0 + discovery._OPEN_MONTH_TTL):
+                _fetch_sitemap_urls(now.year, now.month)
+
+        assert mock_get.call_count == 2
+
+    def test_failure_is_not_cached(self):
+        from unittest.mock import patch, MagicMock
+        mock_resp = MagicMock(status_code=404)
+
+        with patch("financial_scraper.transcripts.discovery.requests.get",
+                   return_value=mock_resp) as mock_get:
+            _fetch_sitemap_urls(2025, 1)
+            _fetch_sitemap_urls(2025, 1)
+
+        assert mock_get.call_count == 2
+
+
+class TestIndexTranscripts:
+    def test_groups_by_ticker_and_skips_non_transcripts(self):
+        from financial_scraper.transcripts.discovery import _index_transcripts
+        index = _index_transcripts([
+            "https://www.fool.com/earnings/call-transcripts/2025/01/30/apple-aapl-q1-2025-earnings-call-transcript/",
+            "https://www.fool.com/earnings/call-transcripts/2025/02/05/berkshire-brk-a-q4-2024-earnings-call-transcript/",
+            "https://www.fool.com/some-other-article/",
+        ])
+        assert set(index) == {"AAPL", "BRK.A"}
+        assert index["AAPL"][0].quarter == "Q1"
+
 
 class TestDiscoverTranscripts:
     def test_discovers_matching_ticker(self):
@@ -909,7 +1088,7 @@ class TestTranscriptPipelineRangeMode:
             company="Apple", ticker="AAPL", quarter="Q1", year=2022,
             date="2022-01-28", full_text="Strong results in our first quarter. " * 30,
         )
-        mock_resp = MagicMock(status_code=200, text="<html></html>")
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
 
         cfg = _make_range_config(tmp_path)
         p = TranscriptPipeline(cfg)
@@ -953,7 +1132,7 @@ class TestTranscriptPipelineRangeMode:
             for y in range(2, 4)
         ]
 
-        mock_resp = MagicMock(status_code=200, text="<html></html>")
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
         cfg = _make_range_config(tmp_path)
         p = TranscriptPipeline(cfg)
 
@@ -967,3 +1146,171 @@ class TestTranscriptPipelineRangeMode:
 
         table = pq.read_table(tmp_path / "out.parquet")
         assert table.num_rows == 2
+
+    def test_range_mode_batches_tickers_into_one_row_group(self, tmp_path):
+        """Records from several tickers are buffered and written together."""
+        from financial_scraper.transcripts.pipeline import TranscriptPipeline
+        from unittest.mock import patch, MagicMock
+        import pyarrow.parquet as pq
+
+        bulk = {
+            t: [TranscriptInfo(
+                url=f"https://www.fool.com/earnings/call-transcripts/2022/01/28/{t.lower()}-q1-2022/",
+                ticker=t, quarter="Q1", year=2022, pub_date="2022-01-28",
+            )]
+            for t in ("AAPL", "MSFT")
+        }
+        extract_results = [
+            TranscriptResult(
+                company=t, ticker=t, quarter="Q1", year=2022, date="2022-01-28",
+                full_text=f"{t} first quarter results were strong. " * 20,
+            )
+            for t in ("AAPL", "MSFT")
+        ]
+
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
+        cfg = _make_range_config(tmp_path)
+        p = TranscriptPipeline(cfg)
+        # No interval save (and so no pre-save flush) between the two tickers
+        p._checkpoint._last_save_time = time.monotonic()
+
+        with patch("financial_scraper.transcripts.pipeline.discover_transcripts_range",
+                   return_value=bulk):
+            with patch.object(p._session, "get", return_value=mock_resp):
+                with patch("financial_scraper.transcripts.pipeline.extract_transcript",
+                           side_effect=extract_results):
+                    with patch("financial_scraper.transcripts.pipeline.time.sleep"):
+                        p.run()
+
+        meta = pq.ParquetFile(tmp_path / "out.parquet").metadata
+        assert meta.num_rows == 2
+        assert meta.num_row_groups == 1
+
+    def test_checkpoint_save_flushes_pending_records(self, tmp_path):
+        """A saved checkpoint never marks URLs whose rows are still buffered."""
+        from financial_scraper.transcripts.pipeline import TranscriptPipeline
+        from financial_scraper.store.output import SCHEMA, ParquetWriter
+        import pyarrow.parquet as pq
+
+        p = TranscriptPipeline(_make_range_config(tmp_path))
+        url = "https://www.fool.com/earnings/call-transcripts/2022/01/28/aapl-q1-2022/"
+        p._pending = {name: ["2022-01-28" if name == "date" else ""] for name in SCHEMA.names}
+        p._pending["link"] = [url]
+        p._checkpoint.mark_url_fetched(url)
+        p._checkpoint.save()
+
+        # Killed here: the next writer for the path recovers the sealed rows.
+        ParquetWriter(tmp_path / "out.parquet").close()
+        assert pq.read_table(tmp_path / "out.parquet").column("link").to_pylist() == [url]
+        assert not p._pending["link"]
+
+    def test_full_buffer_is_written_with_a_checkpoint_save(self, tmp_path, monkeypatch):
+        """Reaching _PARQUET_BATCH saves the checkpoint, which writes the buffer."""
+        from financial_scraper.transcripts import pipeline as tp
+        from unittest.mock import patch, MagicMock
+
+        bulk = {
+            t: [TranscriptInfo(
+                url=f"https://www.fool.com/earnings/call-transcripts/2022/01/28/{t.lower()}-q1-2022/",
+                ticker=t, quarter="Q1", year=2022, pub_date="2022-01-28",
+            )]
+            for t in ("AAPL", "MSFT")
+        }
+        extract_results = [
+            TranscriptResult(
+                company=t, ticker=t, quarter="Q1", year=2022, date="2022-01-28",
+                full_text=f"{t} first quarter results were strong. " * 20,
+            )
+            for t in ("AAPL", "MSFT")
+        ]
+        monkeypatch.setattr(tp, "_PARQUET_BATCH", 1)
+        p = tp.TranscriptPipeline(_make_range_config(tmp_path))
+        p._checkpoint._last_save_time = time.monotonic()
+        saved = []
+        real_save = p._checkpoint.save
+
+        def save():
+            real_save()
+            saved.append((len(p._checkpoint.fetched_urls), len(p._pending["link"])))
+
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
+        with patch.object(tp, "discover_transcripts_range", return_value=bulk), \
+                patch.object(p._checkpoint, "save", side_effect=save), \
+                patch.object(p._session, "get", return_value=mock_resp), \
+                patch.object(tp, "extract_transcript", side_effect=extract_results):
+            p.run()
+
+        assert saved == [(1, 0), (2, 0), (2, 0)]
+
+    def test_long_ticker_checkpoints_mid_run(self, tmp_path, monkeypatch):
+        """A full buffer is saved together with the checkpoint inside the ticker."""
+        from financial_scraper.transcripts import pipeline as tp
+        from unittest.mock import patch, MagicMock
+        import pyarrow.parquet as pq
+
+        infos = [
+            TranscriptInfo(
+                url=f"https://www.fool.com/earnings/call-transcripts/202{y}/01/28/aapl-q1-202{y}/",
+                ticker="AAPL", quarter="Q1", year=2020 + y, pub_date=f"202{y}-01-28",
+            )
+            for y in range(2, 4)
+        ]
+        extract_results = [
+            TranscriptResult(
+                company="Apple", ticker="AAPL", quarter="Q1", year=2020 + y,
+                date=f"202{y}-01-28", full_text=f"FY202{y} results were strong. " * 20,
+            )
+            for y in range(2, 4)
+        ]
+        monkeypatch.setattr(tp, "_PARQUET_BATCH", 1)
+        p = tp.TranscriptPipeline(_make_range_config(tmp_path, tickers=("AAPL",)))
+        p._checkpoint._last_save_time = time.monotonic()
+        saved = []
+        real_save = p._checkpoint.save
+
+        def save():
+            real_save()
+            saved.append((len(p._checkpoint.fetched_urls), len(p._pending["link"])))
+
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
+        with patch.object(tp, "discover_transcripts_range", return_value={"AAPL": infos}), \
+                patch.object(p._checkpoint, "save", side_effect=save), \
+                patch.object(p._session, "get", return_value=mock_resp), \
+                patch.object(tp, "extract_transcript", side_effect=extract_results):
+            p.run()
+
+        assert saved[0] == (1, 0)
+        table = pq.read_table(tmp_path / "out.parquet")
+        assert sorted(table.column("link").to_pylist()) == [i.url for i in infos]
+
+    def test_error_saves_buffered_rows_with_checkpoint(self, tmp_path):
+        """Rows buffered when the run fails are written only with a checkpoint save."""
+        from financial_scraper.transcripts.pipeline import TranscriptPipeline
+        from financial_scraper.checkpoint import Checkpoint
+        from unittest.mock import patch, MagicMock
+        import pyarrow.parquet as pq
+
+        url = "https://www.fool.com/earnings/call-transcripts/2022/01/28/aapl-q1-2022/"
+        bulk = {"AAPL": [TranscriptInfo(
+            url=url, ticker="AAPL", quarter="Q1", year=2022, pub_date="2022-01-28",
+        )]}
+        result = TranscriptResult(
+            company="Apple", ticker="AAPL", quarter="Q1", year=2022,
+            date="2022-01-28", full_text="Results were strong. " * 20,
+        )
+        p = TranscriptPipeline(_make_range_config(tmp_path))
+        mock_resp = MagicMock(status_code=200, text="<html></html>", headers={})
+        with patch("financial_scraper.transcripts.pipeline.discover_transcripts_range",
+                   return_value=bulk), \
+                patch.object(p._session, "get", return_value=mock_resp), \
+                patch("financial_scraper.transcripts.pipeline.extract_transcript",
+                      return_value=result), \
+                patch.object(p._checkpoint, "save_if_due",
+                             side_effect=[None, RuntimeError("boom")]):
+            with pytest.raises(RuntimeError):
+                p.run()
+
+        cp = Checkpoint(tmp_path / "cp.json")
+        cp.load()
+        assert cp.is_url_fetched(url)
+        assert pq.read_table(tmp_path / "out.parquet").column("link").to_pylist() == [url]